@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 
 from ..config import AppConfig, AppConfigUpdate, apply_update
+from ..services.kicad_paths import clear_kicad_config_cache
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
@@ -25,4 +26,5 @@ def update_config(
 ) -> dict:
     new_config = apply_update(current, payload, config_path=current.config_path)
     request.app.state.config = new_config
+    clear_kicad_config_cache()
     return new_config.to_safe_dict()
@@ -6,7 +6,8 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status, File, UploadFile
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from ..config import AppConfig
 from ..db.deps import get_db
@@ -16,6 +17,7 @@ from ..services import extract, scan as scan_service
 from ..services import preview as preview_service
 from ..services import uploads as upload_service
 from ..services import candidate_cache
+from ..services import cleanup as cleanup_service
 from .uploads_routes import ALLOWED_EXTS, _persist_components, _validate_zip_or_raise
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -206,6 +208,7 @@ def _ensure_candidate_path(
             Path(cfg.temp_dir),
             original_filename=job.original_filename,
             target_dir=target_dir,
+            reuse_existing=True,
         )
     except Exception:
         return None
@@ -324,7 +327,10 @@ def save_selection(
 
 @router.post("/{job_id}/import")
 async def import_job(job_id: int, request: Request, db: Session = Depends(get_db)) -> Dict[str, Any]:
-    job = db.get(Job, job_id)
+    # The importer walks every component's candidates; load them in two IN queries instead of one per component.
+    job = db.execute(
+        select(Job).where(Job.id == job_id).options(selectinload(Job.components).selectinload(Component.candidates))
+    ).scalar_one_or_none()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     payload: Dict[str, Any] = {}
@@ -347,6 +353,7 @@ async def import_job(job_id: int, request: Request, db: Session = Depends(get_db
         model_dir=model_root,
         subfolder=subfolder,
         rename_to=rename_to,
+        symbol_index_dir=Path(config.data_dir) / "symbol_index",
     )
     return {
         "job_id": job.id,
@@ -454,8 +461,7 @@ def delete_job(job_id: int, request: Request, db: Session = Depends(get_db)) ->
             try:
                 path = Path(path_str)
                 if path.is_dir():
-                    import shutil
-                    shutil.rmtree(path, ignore_errors=True)
+                    cleanup_service.remove_tree(path)
                 else:
                     path.unlink(missing_ok=True)
             except Exception:
@@ -501,7 +507,8 @@ def candidate_render(candidate_id: int, request: Request, db: Session = Depends(
     try:
         if not _ensure_candidate_path(cand, cfg, db):
             raise FileNotFoundError(cand.path)
-        image_data, note = preview_service.render_candidate_preview(cand)
+        thumbnail_dir = candidate_cache.preview_dir(cfg, cand.component.job_id)
+        image_data, note = preview_service.render_candidate_preview(cand, thumbnail_dir)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Candidate file not found")
     except Exception as exc:
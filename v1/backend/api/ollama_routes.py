@@ -61,6 +61,10 @@ def _maybe_fallback_host(base_url: str) -> str | None:
     return _with_host(base_url, "host.docker.internal")
 
 
+def _http_client(request: Request):
+    return getattr(request.app.state, "ollama_http", None)
+
+
 @router.get("/test")
 async def ollama_test(
     request: Request,
@@ -76,7 +80,7 @@ async def ollama_test(
         effective_enabled = True  # allow ad-hoc test even if not yet saved
     if not effective_enabled:
         return {"enabled": False, "message": "Enable Ollama in settings to run the test"}
-    client = OllamaClient(target_url, target_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries)
+    client = OllamaClient(target_url, target_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries, _http_client(request))
     fallback_url = _maybe_fallback_host(target_url)
     tried_fallback = False
     try:
@@ -86,7 +90,7 @@ async def ollama_test(
         if fallback_url and "Name or service not known" in str(exc):
             tried_fallback = True
             try:
-                fb_client = OllamaClient(fallback_url, target_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries)
+                fb_client = OllamaClient(fallback_url, target_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries, _http_client(request))
                 result = await fb_client.health()
                 return {
                     "enabled": True,
@@ -114,7 +118,7 @@ async def ollama_test(
 async def list_models(request: Request, base_url: str | None = None):
     cfg = get_config(request)
     target_url = _normalize_base_url(base_url or cfg.ollama_base_url)
-    client = OllamaClient(target_url, cfg.ollama_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries)
+    client = OllamaClient(target_url, cfg.ollama_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries, _http_client(request))
     fallback_url = _maybe_fallback_host(target_url)
     try:
         models = await client.list_models()
@@ -122,7 +126,7 @@ async def list_models(request: Request, base_url: str | None = None):
     except Exception as exc:
         if fallback_url and "Name or service not known" in str(exc):
             try:
-                fb_client = OllamaClient(fallback_url, cfg.ollama_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries)
+                fb_client = OllamaClient(fallback_url, cfg.ollama_model, cfg.ollama_timeout_sec, cfg.ollama_max_retries, _http_client(request))
                 models = await fb_client.list_models()
                 return {"models": models, "base_url": fallback_url, "note": f"Original host '{target_url}' not reachable; using host.docker.internal."}
             except Exception as fb_exc:
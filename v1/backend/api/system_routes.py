@@ -12,7 +12,12 @@ from ..config import AppConfig
 from ..db.deps import get_db
 from ..db.models import Job
 from ..services import importer
-from ..services.kicad_paths import find_kicad_config_dir, kicad_root_hint, map_kicad_visible_path
+from ..services.kicad_paths import (
+    clear_kicad_config_cache,
+    find_kicad_config_dir,
+    kicad_root_hint,
+    map_kicad_visible_path,
+)
 
 router = APIRouter(tags=["system"])
 
@@ -164,6 +169,7 @@ def _ensure_kicad_config_dir(cfg: AppConfig) -> Path:
             kicad_dir.mkdir(parents=True, exist_ok=True)
         except Exception:
             continue
+        clear_kicad_config_cache()
         return kicad_dir
 
     raise HTTPException(
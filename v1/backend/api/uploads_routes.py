@@ -155,6 +155,7 @@ async def _process_upload(
                 config.ollama_model,
                 config.ollama_timeout_sec,
                 config.ollama_max_retries,
+                http_client=getattr(request.app.state, "ollama_http", None),
             )
             scores = await client.score_candidates(job.id, comp_objs)
             if scores:
@@ -189,6 +190,14 @@ def _persist_components(
     for cand in candidates:
         grouped.setdefault(cand.name, []).append(cand)
 
+    resolved_cache_root: Path | None = None
+    if cache_root:
+        try:
+            cache_root.mkdir(parents=True, exist_ok=True)
+            resolved_cache_root = cache_root.resolve()
+        except Exception:
+            resolved_cache_root = None
+
     comp_objs: list[Component] = []
     response_components: list[Dict[str, Any]] = []
     for name, cand_list in grouped.items():
@@ -210,6 +219,7 @@ def _persist_components(
                         cache_root,
                         str(cand.rel_path) if cand.rel_path else None,
                         cand.name,
+                        resolved_cache_dir=resolved_cache_root,
                     )
                 except Exception:
                     cached_path = None
@@ -350,7 +360,7 @@ async def _download_url_to_uploads(url: str, destination_dir: Path) -> tuple[Pat
                 md5 = hashlib.md5()
                 try:
                     with os.fdopen(fd, "wb") as out_file:
-                        async for chunk in resp.aiter_bytes(chunk_size=8192):
+                        async for chunk in resp.aiter_bytes(chunk_size=upload_service.UPLOAD_CHUNK_BYTES):
                             if not chunk:
                                 continue
                             written += len(chunk)
@@ -6,38 +6,59 @@ from pathlib import Path
 from typing import Iterator
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..config import AppConfig
 
 SQLITE_TIMEOUT_SEC = float(os.getenv("KICOMPORT_SQLITE_TIMEOUT_SEC", "30"))
 SQLITE_WAL_ENABLED = os.getenv("KICOMPORT_SQLITE_WAL", "1").strip().lower() not in {"0", "false", "no", "off"}
+SQLITE_CACHE_SIZE_KB = int(os.getenv("KICOMPORT_SQLITE_CACHE_KB", "64000"))
+SQLITE_MMAP_SIZE = int(os.getenv("KICOMPORT_SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+SQLITE_POOL_SIZE = int(os.getenv("KICOMPORT_SQLITE_POOL_SIZE", "5"))
+SQLITE_POOL_MAX_OVERFLOW = int(os.getenv("KICOMPORT_SQLITE_POOL_MAX_OVERFLOW", "10"))
 
+# One engine (and therefore one connection pool) per database URI.
+_ENGINES: dict[str, Engine] = {}
 
-def get_engine(config: AppConfig):
-    """Create a SQLAlchemy engine for the configured SQLite database."""
+
+def get_engine(config: AppConfig) -> Engine:
+    """Return the shared SQLAlchemy engine for the configured SQLite database."""
     db_path = Path(config.database_path)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
     uri = f"sqlite:///{db_path}"
-    engine = create_engine(uri, connect_args={"check_same_thread": False, "timeout": SQLITE_TIMEOUT_SEC})
+    engine = _ENGINES.get(uri)
+    if engine is not None:
+        return engine
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(
+        uri,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_TIMEOUT_SEC},
+        pool_size=SQLITE_POOL_SIZE,
+        max_overflow=SQLITE_POOL_MAX_OVERFLOW,
+    )
 
-    if SQLITE_WAL_ENABLED:
-        @event.listens_for(engine, "connect")
-        def _set_sqlite_pragmas(dbapi_connection, connection_record):  # type: ignore[no-redef]
-            cursor = dbapi_connection.cursor()
-            try:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):  # type: ignore[no-redef]
+        cursor = dbapi_connection.cursor()
+        try:
+            if SQLITE_WAL_ENABLED:
                 cursor.execute("PRAGMA journal_mode=WAL;")
                 cursor.execute("PRAGMA synchronous=NORMAL;")
                 cursor.execute("PRAGMA foreign_keys=ON;")
+            # Per-connection tuning; pooled connections keep these for their lifetime.
+            cursor.execute("PRAGMA temp_store=MEMORY;")
+            cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};")
+        except Exception:
+            # Best-effort: don't block startup on filesystem/driver limitations.
+            pass
+        finally:
+            try:
+                cursor.close()
             except Exception:
-                # Best-effort: don't block startup on filesystem/driver limitations.
                 pass
-            finally:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
 
+    _ENGINES[uri] = engine
     return engine
 
 
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import time
 import uuid
 from pathlib import Path
+from urllib.parse import parse_qsl
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 
 from .api import config_routes
 from .api.health import healthcheck, router as health_router
@@ -19,147 +25,72 @@ from .config import load_config
 from .db.models import CandidateFile, Component, Job, JobLog, JobStatus
 from .db.models import Base
 from .db.session import get_engine, get_session_factory
-from .services import importer
 from .services import cleanup as cleanup_service
+from .services import library_snapshot as library_snapshot_service
+from .services import ollama as ollama_service
 from .services.kicad_paths import find_kicad_config_dir, kicad_root_hint, map_kicad_visible_path
 from .services.logger import setup_logging
 
 TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "frontend" / "templates"
 STATIC_DIR = Path(__file__).resolve().parents[1] / "frontend" / "static"
+TEMPLATE_AUTO_RELOAD = os.getenv("KICOMPORT_TEMPLATE_AUTO_RELOAD", "1").strip().lower() not in {"0", "false", "no", "off"}
 
-MODEL_EXTS = {".step", ".stp", ".wrl", ".obj"}
+class RevisionedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache revision-stamped URLs (`?v=<mtime>`) for a week.
 
+    The revision is checked against the served file's own mtime, so a stale or foreign `v`
+    never marks a different version of the file immutable.
+    """
 
-def _count_kicad_symbols(sym_path: Path, sample_limit: int = 8) -> tuple[int, list[str]]:
-    if not sym_path.exists():
-        return 0, []
-    try:
-        text = sym_path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return 0, []
-
-    names: list[str] = []
-    depth = 0
-    in_string = False
-    escape = False
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if in_string:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == '"':
-                in_string = False
-            i += 1
-            continue
-
-        if ch == '"':
-            in_string = True
-            i += 1
-            continue
-
-        if ch == "(":
-            depth_before = depth
-            depth += 1
-            i += 1
-            # Only count top-level (kicad_symbol_lib ... (symbol "...") ...) entries.
-            if depth_before != 1:
-                continue
-
-            while i < len(text) and text[i].isspace():
-                i += 1
-            atom_start = i
-            while i < len(text) and (not text[i].isspace()) and text[i] not in "()":
-                i += 1
-            atom = text[atom_start:i]
-            if atom != "symbol":
-                continue
-
-            while i < len(text) and text[i].isspace():
-                i += 1
-            name = ""
-            if i < len(text) and text[i] == '"':
-                i += 1
-                buf: list[str] = []
-                esc2 = False
-                while i < len(text):
-                    ch2 = text[i]
-                    if esc2:
-                        buf.append(ch2)
-                        esc2 = False
-                    elif ch2 == "\\":
-                        esc2 = True
-                    elif ch2 == '"':
-                        break
-                    else:
-                        buf.append(ch2)
-                    i += 1
-                if i < len(text) and text[i] == '"':
-                    i += 1
-                name = "".join(buf).strip()
-            else:
-                name_start = i
-                while i < len(text) and (not text[i].isspace()) and text[i] not in "()":
-                    i += 1
-                name = text[name_start:i].strip()
-
-            if name:
-                names.append(name)
-            continue
-
-        if ch == ")":
-            depth = max(0, depth - 1)
-            i += 1
-            continue
-
-        i += 1
-
-    sample = sorted(set(names), key=lambda s: s.casefold())[:sample_limit]
-    return len(set(names)), sample
-
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        query = scope.get("query_string", b"")
+        if query and dict(parse_qsl(query.decode("latin-1"))).get("v") == str(int(stat_result.st_mtime)):
+            response.headers["Cache-Control"] = "public, max-age=604800, immutable"
+        return response
 
-def _count_files(root: Path, *, suffixes: set[str] | None = None, pattern: str | None = None, sample_limit: int = 8) -> tuple[int, list[str]]:
-    if not root.exists():
-        return 0, []
-    if not root.is_dir():
-        return 0, []
 
-    count = 0
-    sample: list[str] = []
+def _static_revisions(directory: Path) -> dict[str, int]:
+    """Map each top-level static file to its mtime, the `?v=` revision RevisionedStaticFiles expects."""
+    revisions: dict[str, int] = {}
     try:
-        if pattern is not None:
-            iterator = root.rglob(pattern)
-        else:
-            iterator = root.rglob("*")
-
-        for path in iterator:
-            if not path.is_file():
-                continue
-            if suffixes is not None and path.suffix.lower() not in suffixes:
-                continue
-            count += 1
-            if len(sample) < sample_limit:
-                try:
-                    sample.append(str(path.relative_to(root)))
-                except Exception:
-                    sample.append(path.name)
-    except Exception:
-        return 0, []
-
-    sample.sort(key=lambda s: s.casefold())
-    return count, sample
+        entries = list(os.scandir(directory))
+    except OSError:
+        return revisions
+    for entry in entries:
+        try:
+            if entry.is_file():
+                revisions[entry.name] = int(entry.stat().st_mtime)
+        except OSError:
+            continue
+    return revisions
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Global KiCad Library Import Server", version="0.1.0", docs_url="/docs")
     templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
+    static_revisions = _static_revisions(STATIC_DIR)
+    templates.env.globals["static_rev"] = lambda name: static_revisions.get(name, "")
+    templates.env.filters["basename"] = lambda value: os.path.basename(str(value)) if value else ""
+    templates.env.auto_reload = TEMPLATE_AUTO_RELOAD
     try:
-        templates.env.globals["static_rev"] = int((STATIC_DIR / "styles.css").stat().st_mtime)
-    except Exception:
-        templates.env.globals["static_rev"] = int(time.time())
-    templates.env.filters["basename"] = lambda value: Path(str(value)).name if value else ""
+        # No directory argument: Jinja uses a per-user temp dir and refuses one it doesn't own
+        # (a shared, predictable /tmp path would let other local users plant bytecode).
+        templates.env.bytecode_cache = FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        pass
+    # Compile templates up front so requests only pay for rendering.
+    for template_name in templates.env.list_templates(extensions=["html"]):
+        try:
+            templates.env.get_template(template_name)
+        except Exception:
+            pass
+
+    # Declared up front so handlers can read state with plain attribute access before/after startup.
+    app.state.config = None
+    app.state.logger = None
+    app.state.db_session_factory = None
+    app.state.ollama_http = None
 
     @app.on_event("startup")
     async def load_app_config() -> None:
@@ -169,6 +100,8 @@ def create_app() -> FastAPI:
         Base.metadata.create_all(engine)
         app.state.db_session_factory = get_session_factory(app.state.config)
         app.state.templates = templates
+        app.state.snapshot_cache = library_snapshot_service.SNAPSHOT_CACHE
+        app.state.ollama_http = ollama_service.create_http_client()
         # Housekeeping: purge old jobs and clean orphaned files.
         session = None
         try:
@@ -176,14 +109,15 @@ def create_app() -> FastAPI:
             purged = cleanup_service.purge_expired_jobs(session, app.state.config)
             orphans = cleanup_service.cleanup_orphans(session, app.state.config)
             session.commit()
-            logger = getattr(app.state, "logger", None)
+            logger = app.state.logger
             if logger:
                 if purged:
-                    logger.info(f"startup.cleanup purged_jobs={purged}")
+                    logger.info("startup.cleanup purged_jobs=%s", purged)
                 if orphans.get("removed_uploads") or orphans.get("removed_temp_dirs"):
                     logger.info(
-                        "startup.cleanup orphans "
-                        f"uploads={orphans.get('removed_uploads')} temp_dirs={orphans.get('removed_temp_dirs')}"
+                        "startup.cleanup orphans uploads=%s temp_dirs=%s",
+                        orphans.get("removed_uploads"),
+                        orphans.get("removed_temp_dirs"),
                     )
         except Exception:
             if session:
@@ -191,7 +125,7 @@ def create_app() -> FastAPI:
                     session.rollback()
                 except Exception:
                     pass
-            logger = getattr(app.state, "logger", None)
+            logger = app.state.logger
             if logger:
                 logger.exception("startup.cleanup_failed")
         finally:
@@ -200,6 +134,14 @@ def create_app() -> FastAPI:
                     session.close()
                 except Exception:
                     pass
+        # Cleanup may have touched the library folders; start with a cold snapshot cache.
+        app.state.snapshot_cache.clear()
+
+    @app.on_event("shutdown")
+    async def close_http_clients() -> None:
+        if app.state.ollama_http is not None:
+            await app.state.ollama_http.aclose()
+            app.state.ollama_http = None
 
     app.include_router(health_router)
     app.include_router(config_routes.router)
@@ -208,158 +150,102 @@ def create_app() -> FastAPI:
     app.include_router(ollama_router)
     app.include_router(system_router)
 
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    app.mount(
+        "/static",
+        RevisionedStaticFiles(directory=str(STATIC_DIR)),
+        name="static",
+    )
 
     def _get_session():
-        factory = getattr(app.state, "db_session_factory", None)
+        factory = app.state.db_session_factory
         if not factory:
             return None
         return factory()
 
-    def _fetch_jobs_and_logs():
+    def _fetch_jobs_and_logs(session):
         jobs = []
         recent_logs = []
-        session = _get_session()
-        if not session:
-            return jobs, recent_logs
         try:
             jobs = session.query(Job).order_by(Job.created_at.desc()).limit(20).all()
             recent_logs = session.query(JobLog).order_by(JobLog.created_at.desc()).limit(20).all()
         except Exception:
-            logger = getattr(app.state, "logger", None)
+            logger = app.state.logger
             if logger:
                 logger.exception("home.load_failed while loading dashboard data")
-        finally:
-            session.close()
         return jobs, recent_logs
 
-    def _library_snapshot(cfg):
-        libraries = []
-        if not cfg:
-            return libraries
-        logger = getattr(app.state, "logger", None)
-        lib_name = importer.DEFAULT_SUBFOLDER
-        symbol_path = Path(cfg.kicad_symbol_dir) / f"{lib_name}.kicad_sym"
-        footprint_path = Path(cfg.kicad_footprint_dir) / f"{lib_name}.pretty"
-        model_path = Path(cfg.kicad_3d_dir) / lib_name
-        kicad_cfg = find_kicad_config_dir(cfg)
-        root_hint = kicad_root_hint(kicad_cfg)
-
-        for label, path in [
-            ("Symbols", symbol_path),
-            ("Footprints", footprint_path),
-            ("3D Models", model_path),
-        ]:
-            raw_path = str(path)
-            kicad_path = map_kicad_visible_path(raw_path, root_hint)
-            entry = {
-                "label": label,
-                "path": raw_path,
-                "kicad_path": kicad_path,
-                "kicad_path_exists": False,
-                "path_issue": False,
-                "issue_reason": None,
-                "exists": False,
-                "count": 0,
-                "sample": [],
-                "truncated": False,
-            }
-            kicad_root_exists = True
-            if kicad_path.startswith("/config/") or kicad_path == "/config":
-                kicad_root_exists = Path("/config").exists()
-            elif kicad_path.startswith("/kicad/") or kicad_path == "/kicad":
-                kicad_root_exists = Path("/kicad").exists()
-            if kicad_root_exists:
-                entry["kicad_path_exists"] = Path(kicad_path).exists()
-            try:
-                p = Path(path)
-                entry["exists"] = p.exists()
-                if root_hint == "/config" and raw_path.startswith("/kicad/"):
-                    entry["path_issue"] = True
-                    entry["issue_reason"] = "kicad_root_mismatch"
-                if not p.exists():
-                    libraries.append(entry)
-                    continue
-
-                if label == "Symbols":
-                    count, sample = _count_kicad_symbols(p)
-                elif label == "Footprints":
-                    count, sample = _count_files(p, pattern="*.kicad_mod")
-                else:
-                    count, sample = _count_files(p, suffixes=MODEL_EXTS)
-
-                entry["count"] = count
-                entry["sample"] = sample
-                if (
-                    kicad_path
-                    and kicad_path != raw_path
-                    and kicad_root_exists
-                    and not entry["kicad_path_exists"]
-                ):
-                    entry["path_issue"] = True
-                    entry["issue_reason"] = "kicad_path_missing"
-            except Exception:
-                if logger:
-                    logger.exception("home.library_snapshot_failed", extra={"label": label, "path": str(path)})
-            libraries.append(entry)
-        return libraries
-
     @app.middleware("http")
     async def add_request_id_and_log(request: Request, call_next):
-        request_id = str(uuid.uuid4())
+        request_id = uuid.uuid4().hex
         request.state.request_id = request_id
-        logger = getattr(app.state, "logger", None)
-        start = time.time()
+        path = request.url.path
+        if path.startswith("/static/"):
+            # Asset hits are frequent and uninteresting; tag them but skip logging.
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        logger = app.state.logger
+        start = time.perf_counter()
         if logger:
-            logger.info(f"request.start path={request.url.path} rid={request_id}")
+            logger.info("request.start path=%s rid=%s", path, request_id)
         response = await call_next(request)
-        duration_ms = int((time.time() - start) * 1000)
+        duration_ms = int((time.perf_counter() - start) * 1000)
         response.headers["X-Request-ID"] = request_id
         if logger:
-            logger.info(f"request.end path={request.url.path} rid={request_id} status={response.status_code} dur_ms={duration_ms}")
+            logger.info("request.end path=%s rid=%s status=%d dur_ms=%d", path, request_id, response.status_code, duration_ms)
         return response
 
     @app.get("/", include_in_schema=False)
     async def root():
         return RedirectResponse(url="/ui/jobs", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
-    def _fetch_job_detail(job_id: int) -> Job | None:
+    def _fetch_job_detail(session, job_id: int) -> Job | None:
+        stmt = (
+            select(Job)
+            .where(Job.id == job_id)
+            .options(
+                selectinload(Job.components).selectinload(Component.candidates),
+                selectinload(Job.logs),
+            )
+        )
+        return session.execute(stmt).scalar_one_or_none()
+
+    def _load_dashboard(job_id: int | None):
+        # One session (and one pooled connection) for every DB read the page needs.
         session = _get_session()
         if not session:
-            return None
+            return [], [], None
         try:
-            job = session.get(Job, job_id)
-            if not job:
-                return None
-            session.refresh(job)
-            for comp in job.components:
-                _ = comp.candidates
-            _ = job.logs
-            return job
+            jobs, recent_logs = _fetch_jobs_and_logs(session)
+            selected_job = _fetch_job_detail(session, job_id) if job_id else None
+            return jobs, recent_logs, selected_job
         finally:
             session.close()
 
     @app.get("/ui/jobs", response_class=HTMLResponse, include_in_schema=False)
     async def index(request: Request, job_id: int | None = None):
-        config = getattr(request.app.state, "config", None)
-        jobs, recent_logs = _fetch_jobs_and_logs()
-        libraries = _library_snapshot(config)
-        selected_job = _fetch_job_detail(job_id) if job_id else None
-        kicad_cfg = find_kicad_config_dir(config) if config else None
-        root_hint = kicad_root_hint(kicad_cfg)
+        config = app.state.config
+        # Looked up per request so a KiCad config dir created after startup is picked up; the
+        # lookup is memoized (with a short negative TTL) in kicad_paths.
+        root_hint = kicad_root_hint(find_kicad_config_dir(config))
+        # DB reads and library filesystem scans are blocking; run them side by side off the event loop.
+        (jobs, recent_logs, selected_job), libraries = await asyncio.gather(
+            asyncio.to_thread(_load_dashboard, job_id),
+            asyncio.to_thread(library_snapshot_service.library_snapshot, config, root_hint, app.state.logger),
+        )
         def _kicad_visible_path(value: object) -> str:
             raw = str(value or "")
             return map_kicad_visible_path(raw, root_hint)
 
         import_paths = {
-            "symbol_root": str(getattr(config, "kicad_symbol_dir", "")) if config else "",
-            "footprint_root": str(getattr(config, "kicad_footprint_dir", "")) if config else "",
-            "model_root": str(getattr(config, "kicad_3d_dir", "")) if config else "",
+            "symbol_root": str(config.kicad_symbol_dir) if config else "",
+            "footprint_root": str(config.kicad_footprint_dir) if config else "",
+            "model_root": str(config.kicad_3d_dir) if config else "",
         }
         kicad_import_paths = {
-            "symbol_root": _kicad_visible_path(getattr(config, "kicad_symbol_dir", "")) if config else "",
-            "footprint_root": _kicad_visible_path(getattr(config, "kicad_footprint_dir", "")) if config else "",
-            "model_root": _kicad_visible_path(getattr(config, "kicad_3d_dir", "")) if config else "",
+            "symbol_root": _kicad_visible_path(config.kicad_symbol_dir) if config else "",
+            "footprint_root": _kicad_visible_path(config.kicad_footprint_dir) if config else "",
+            "model_root": _kicad_visible_path(config.kicad_3d_dir) if config else "",
         }
         return templates.TemplateResponse(
             "index.html",
@@ -376,24 +262,13 @@ def create_app() -> FastAPI:
             },
         )
 
-    def _list_subdirs(root: str) -> list[str]:
-        try:
-            base = Path(root)
-            if not base.exists():
-                return []
-            subs = [p.name for p in base.iterdir() if p.is_dir()]
-            subs.sort(key=lambda s: s.casefold())
-            return subs
-        except Exception:
-            return []
-
     @app.get("/jobs/{job_id}", include_in_schema=False)
     async def job_detail(job_id: int):
         return RedirectResponse(url=f"/ui/jobs?job_id={job_id}", status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
     @app.get("/api-help", response_class=HTMLResponse)
     async def api_help(request: Request):
-        config = getattr(request.app.state, "config", None)
+        config = app.state.config
         return templates.TemplateResponse(
             "api_help.html",
             {
@@ -404,7 +279,7 @@ def create_app() -> FastAPI:
 
     @app.get("/settings", response_class=HTMLResponse)
     async def settings_page(request: Request):
-        config = getattr(request.app.state, "config", None)
+        config = app.state.config
         return templates.TemplateResponse(
             "settings.html",
             {
@@ -416,7 +291,7 @@ def create_app() -> FastAPI:
 
     @app.get("/ui/health", response_class=HTMLResponse, include_in_schema=False)
     async def health_page(request: Request):
-        config = getattr(request.app.state, "config", None)
+        config = app.state.config
         try:
             health = healthcheck()
         except Exception as exc:
@@ -432,7 +307,7 @@ def create_app() -> FastAPI:
 
     @app.get("/ui/config", response_class=HTMLResponse, include_in_schema=False)
     async def config_page(request: Request):
-        config = getattr(request.app.state, "config", None)
+        config = app.state.config
         safe_config = config.to_safe_dict() if config else {}
         config_path = str(config.config_path) if config and config.config_path else None
         return templates.TemplateResponse(
@@ -448,21 +323,24 @@ def create_app() -> FastAPI:
 
     @app.get("/ui/diagnostics", response_class=HTMLResponse, include_in_schema=False)
     async def diagnostics_page(request: Request):
-        config = getattr(request.app.state, "config", None)
+        config = app.state.config
         safe_config = config.to_safe_dict() if config else {}
         config_path = str(config.config_path) if config and config.config_path else None
         stats = {"job_count": 0, "status_counts": {}, "component_count": 0, "candidate_count": 0}
         session = _get_session()
         if session:
             try:
-                stats["job_count"] = session.query(Job).count()
-                stats["component_count"] = session.query(Component).count()
-                stats["candidate_count"] = session.query(CandidateFile).count()
-                stats["status_counts"] = {
-                    status.value: session.query(Job).filter(Job.status == status).count() for status in JobStatus
-                }
+                # One session transaction; the status histogram is a single GROUP BY.
+                stats["job_count"] = session.scalar(select(func.count()).select_from(Job)) or 0
+                stats["component_count"] = session.scalar(select(func.count()).select_from(Component)) or 0
+                stats["candidate_count"] = session.scalar(select(func.count()).select_from(CandidateFile)) or 0
+                status_counts = {status.value: 0 for status in JobStatus}
+                for job_status, count in session.execute(select(Job.status, func.count()).group_by(Job.status)).all():
+                    key = job_status.value if isinstance(job_status, JobStatus) else str(job_status)
+                    status_counts[key] = count
+                stats["status_counts"] = status_counts
             except Exception:
-                logger = getattr(request.app.state, "logger", None)
+                logger = app.state.logger
                 if logger:
                     logger.exception("diagnostics.load_failed")
             finally:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import shutil
 from pathlib import Path
 
@@ -7,12 +8,18 @@ from ..config import AppConfig
 
 
 _CACHE_SUBDIR = "candidate_cache"
+_PREVIEW_SUBDIR = ".previews"
 
 
 def cache_root(cfg: AppConfig, job_id: int) -> Path:
     return Path(cfg.data_dir) / _CACHE_SUBDIR / f"job_{job_id}"
 
 
+def preview_dir(cfg: AppConfig, job_id: int) -> Path:
+    """Rendered preview thumbnails for a job; removed along with the job's cache root."""
+    return cache_root(cfg, job_id) / _PREVIEW_SUBDIR
+
+
 def _safe_rel_path(rel_path: str | None, fallback_name: str) -> Path:
     if rel_path:
         candidate = Path(rel_path)
@@ -21,9 +28,9 @@ def _safe_rel_path(rel_path: str | None, fallback_name: str) -> Path:
     return Path(fallback_name)
 
 
-def _is_within(path: Path, root: Path) -> bool:
+def _is_within(path: Path, resolved_root: Path) -> bool:
     try:
-        path.resolve().relative_to(root.resolve())
+        path.resolve().relative_to(resolved_root)
         return True
     except Exception:
         return False
@@ -34,13 +41,22 @@ def cache_candidate_file(
     cache_dir: Path,
     rel_path: str | None,
     name_hint: str,
+    *,
+    resolved_cache_dir: Path | None = None,
 ) -> Path:
     cache_dir.mkdir(parents=True, exist_ok=True)
-    if _is_within(source_path, cache_dir):
+    if resolved_cache_dir is None:
+        resolved_cache_dir = cache_dir.resolve()
+    if _is_within(source_path, resolved_cache_dir):
         return source_path
     rel = _safe_rel_path(rel_path, source_path.name or name_hint or "candidate")
     target = cache_dir / rel
     target.parent.mkdir(parents=True, exist_ok=True)
-    if not target.exists():
+    # Hardlink when the cache shares a filesystem with the extraction dir; an existing target is a cache hit.
+    try:
+        os.link(source_path, target)
+    except FileExistsError:
+        pass
+    except OSError:
         shutil.copy2(source_path, target)
     return target
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import os
 import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 from ..config import AppConfig
 from ..services import candidate_cache
-from ..db.models import Job
+from ..db.models import CandidateFile, Component, Job, JobLog
 
 _UPLOAD_PREFIXES = ("upload_", "upload_url_")
+# Stay well under SQLite's bound-parameter limit for IN (...) lists.
+_DELETE_BATCH = 500
+_RM_BIN = None if sys.platform == "win32" else shutil.which("rm")
+# Below this many entries a subprocess costs more than shutil.rmtree.
+_RM_MIN_ENTRIES = 1000
+CLEANUP_WORKERS = int(os.getenv("KICOMPORT_CLEANUP_WORKERS", str(min(8, os.cpu_count() or 1))))
+_PARALLEL_CLEANUP_MIN_PATHS = 16
 
 
 def _norm(path: Path) -> str:
@@ -21,10 +33,82 @@ def _norm(path: Path) -> str:
         return str(path)
 
 
+class _Normalizer:
+    """`_norm` with resolved parent directories memoized for the duration of one sweep.
+
+    Most paths share a handful of parents (uploads/temp/cache roots), so only the final
+    component needs an lstat; symlinked entries still go through a full resolve.
+    """
+
+    def __init__(self) -> None:
+        self._parents: dict[Path, str] = {}
+
+    def __call__(self, path: Path) -> str:
+        if path.name in ("", ".", ".."):
+            return _norm(path)
+        try:
+            if path.is_symlink():
+                return _norm(path)
+        except OSError:
+            return _norm(path)
+        return self.child(path.parent, path.name)
+
+    def child(self, parent: Path, name: str) -> str:
+        """Normalized `parent / name` for an entry already known not to be a symlink."""
+        base = self._parents.get(parent)
+        if base is None:
+            base = self._parents[parent] = _norm(parent)
+        return os.path.join(base, name)
+
+
+def _has_many_entries(path: Path, limit: int) -> bool:
+    """True once a walk of `path` (symlinks not followed) has seen `limit` entries; stops early."""
+    seen = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    seen += 1
+                    if seen >= limit:
+                        return True
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+        except OSError:
+            continue
+    return False
+
+
+def remove_tree(path: Path, *, ignore_errors: bool = True) -> None:
+    """
+    Delete a directory tree.
+
+    Large trees (thousands of footprints/models) go to a native `rm -rf`, which needs far fewer
+    interpreter round-trips; small ones, Windows, a missing `rm`, or anything left behind use
+    `shutil.rmtree` so the common case doesn't pay for a subprocess.
+    """
+    path = Path(path).absolute()
+    if _RM_BIN and path.parent != path and _has_many_entries(path, _RM_MIN_ENTRIES):
+        try:
+            subprocess.run(
+                [_RM_BIN, "-rf", "--", str(path)],
+                check=False,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            # `rm` vanished (FileNotFoundError) or couldn't start; rmtree below does the work.
+            pass
+        if not os.path.lexists(path):
+            return
+    shutil.rmtree(path, ignore_errors=ignore_errors)
+
+
 def _remove_path(path: Path) -> bool:
     try:
         if path.is_dir():
-            shutil.rmtree(path, ignore_errors=True)
+            remove_tree(path)
         else:
             path.unlink(missing_ok=True)
         return True
@@ -32,77 +116,94 @@ def _remove_path(path: Path) -> bool:
         return False
 
 
+def _remove_paths(paths: List[Path]) -> int:
+    """Remove every path, returning how many were removed."""
+    workers = min(CLEANUP_WORKERS, len(paths))
+    if workers <= 1 or len(paths) < _PARALLEL_CLEANUP_MIN_PATHS:
+        return sum(_remove_path(path) for path in paths)
+    # Removal waits on unlink/rmdir syscalls (or `rm` children), not on the GIL.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kicomport-cleanup") as pool:
+        return sum(pool.map(_remove_path, paths))
+
+
+def _orphans(root: Path, *, dirs: bool, prefixes: tuple[str, ...], referenced: set[str], norm: _Normalizer) -> List[Path]:
+    """Entries of `root` (files or directories) named with `prefixes` and not in `referenced`."""
+    found: List[Path] = []
+    # scandir's d_type answers is_file/is_dir without a stat per entry; symlinks are never followed.
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                is_kind = entry.is_dir(follow_symlinks=False) if dirs else entry.is_file(follow_symlinks=False)
+                if not is_kind or not entry.name.startswith(prefixes):
+                    continue
+                if norm.child(root, entry.name) in referenced:
+                    continue
+                found.append(Path(entry.path))
+    except Exception:
+        pass
+    return found
+
+
+def _delete_jobs(db: Session, job_ids: list[int]) -> None:
+    """Bulk-delete jobs and their dependent rows (mirrors the ORM delete-orphan cascades)."""
+    for start in range(0, len(job_ids), _DELETE_BATCH):
+        ids = job_ids[start : start + _DELETE_BATCH]
+        component_ids = select(Component.id).where(Component.job_id.in_(ids))
+        # Components point at their selected candidates and candidates at their component; break the cycle first.
+        db.execute(
+            update(Component)
+            .where(Component.job_id.in_(ids))
+            .values(selected_symbol_id=None, selected_footprint_id=None, selected_model_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(CandidateFile)
+            .where(CandidateFile.component_id.in_(component_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(delete(Component).where(Component.job_id.in_(ids)).execution_options(synchronize_session=False))
+        db.execute(delete(JobLog).where(JobLog.job_id.in_(ids)).execution_options(synchronize_session=False))
+        db.execute(delete(Job).where(Job.id.in_(ids)).execution_options(synchronize_session=False))
+
+
 def purge_expired_jobs(db: Session, cfg: AppConfig) -> int:
     days = int(getattr(cfg, "retention_days", 0) or 0)
     if days <= 0:
         return 0
     cutoff = datetime.utcnow() - timedelta(days=days)
-    expired: list[Job] = db.query(Job).filter(Job.updated_at < cutoff).all()
-    for job in expired:
-        for path_str in [job.stored_path, job.extracted_path]:
-            if not path_str:
-                continue
-            _remove_path(Path(path_str))
-        _remove_path(candidate_cache.cache_root(cfg, job.id))
-        db.delete(job)
+    expired = db.execute(
+        select(Job.id, Job.stored_path, Job.extracted_path).where(Job.updated_at < cutoff)
+    ).all()
+    paths: List[Path] = []
+    for job_id, stored_path, extracted_path in expired:
+        paths.extend(Path(path_str) for path_str in (stored_path, extracted_path) if path_str)
+        paths.append(candidate_cache.cache_root(cfg, job_id))
+    _remove_paths(paths)
+    if expired:
+        _delete_jobs(db, [row[0] for row in expired])
     return len(expired)
 
 
 def cleanup_orphans(db: Session, cfg: AppConfig) -> Dict[str, Any]:
-    jobs: list[Job] = db.query(Job).all()
-    referenced_files = {_norm(Path(j.stored_path)) for j in jobs if j.stored_path}
-    referenced_dirs = {_norm(Path(j.extracted_path)) for j in jobs if j.extracted_path}
-    referenced_cache = {_norm(candidate_cache.cache_root(cfg, j.id)) for j in jobs}
+    rows = db.execute(select(Job.id, Job.stored_path, Job.extracted_path)).all()
+    norm = _Normalizer()
+    referenced_files = {norm(Path(stored)) for _, stored, _ in rows if stored}
+    referenced_dirs = {norm(Path(extracted)) for _, _, extracted in rows if extracted}
+    referenced_cache = {norm(candidate_cache.cache_root(cfg, job_id)) for job_id, _, _ in rows}
 
     uploads_dir = Path(cfg.uploads_dir)
     temp_dir = Path(cfg.temp_dir)
     cache_root = candidate_cache.cache_root(cfg, 0).parent
 
-    removed_uploads = 0
-    removed_temp_dirs = 0
-    removed_cache_dirs = 0
-
-    try:
-        if uploads_dir.exists():
-            for p in uploads_dir.iterdir():
-                if not p.is_file():
-                    continue
-                if not p.name.startswith(_UPLOAD_PREFIXES):
-                    continue
-                if _norm(p) in referenced_files:
-                    continue
-                if _remove_path(p):
-                    removed_uploads += 1
-    except Exception:
-        pass
-
-    try:
-        if temp_dir.exists():
-            for p in temp_dir.iterdir():
-                if not p.is_dir():
-                    continue
-                if not (p.name.startswith("job_") or p.name.startswith("upload_")):
-                    continue
-                if _norm(p) in referenced_dirs:
-                    continue
-                if _remove_path(p):
-                    removed_temp_dirs += 1
-    except Exception:
-        pass
-
-    try:
-        if cache_root.exists():
-            for p in cache_root.iterdir():
-                if not p.is_dir():
-                    continue
-                if not p.name.startswith("job_"):
-                    continue
-                if _norm(p) in referenced_cache:
-                    continue
-                if _remove_path(p):
-                    removed_cache_dirs += 1
-    except Exception:
-        pass
+    removed_uploads = _remove_paths(
+        _orphans(uploads_dir, dirs=False, prefixes=_UPLOAD_PREFIXES, referenced=referenced_files, norm=norm)
+    )
+    removed_temp_dirs = _remove_paths(
+        _orphans(temp_dir, dirs=True, prefixes=("job_", "upload_"), referenced=referenced_dirs, norm=norm)
+    )
+    removed_cache_dirs = _remove_paths(
+        _orphans(cache_root, dirs=True, prefixes=("job_",), referenced=referenced_cache, norm=norm)
+    )
 
     return {
         "removed_uploads": removed_uploads,
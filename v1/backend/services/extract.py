@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import os
 import shutil
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 try:
     import rarfile  # type: ignore
@@ -12,10 +14,16 @@ except Exception:
     HAS_RAR = False
 from typing import Iterable
 
+from .cleanup import remove_tree
+
 
 MAX_EXTRACT_FILES = int(os.getenv("KICOMPORT_MAX_EXTRACT_FILES", str(20_000)))
 MAX_EXTRACT_BYTES = int(os.getenv("KICOMPORT_MAX_EXTRACT_BYTES", str(2 * 1024 * 1024 * 1024)))  # 2GB
 MAX_EXTRACT_FILE_BYTES = int(os.getenv("KICOMPORT_MAX_EXTRACT_FILE_BYTES", str(512 * 1024 * 1024)))  # 512MB
+EXTRACT_WORKERS = int(os.getenv("KICOMPORT_EXTRACT_WORKERS", str(min(8, os.cpu_count() or 1))))
+_PARALLEL_EXTRACT_MIN_FILES = 16
+_EXTRACT_MARKER = ".kicomport_extracted_from"
+_EXTRACT_CHUNK_BYTES = 1 << 20  # 1 MiB: per-member Python loop overhead is per chunk
 
 
 def extract_if_needed(
@@ -24,11 +32,26 @@ def extract_if_needed(
     *,
     original_filename: str | None = None,
     target_dir: Path | None = None,
+    reuse_existing: bool = False,
 ) -> Path:
+    """
+    Extract (or copy) an upload into `target_dir` and return it.
+
+    With `reuse_existing`, a target whose marker matches the upload's size/mtime/name is returned
+    as-is instead of being wiped and decompressed again.
+    """
     temp_root.mkdir(parents=True, exist_ok=True)
     target = Path(target_dir) if target_dir else (temp_root / stored_path.stem)
+    marker = target / _EXTRACT_MARKER
+    key = _extract_key(stored_path, original_filename)
+    if reuse_existing and key:
+        try:
+            if marker.read_text(encoding="utf-8") == key:
+                return target
+        except OSError:
+            pass
     if target.exists():
-        shutil.rmtree(target)
+        remove_tree(target, ignore_errors=False)
     target.mkdir(parents=True, exist_ok=True)
 
     try:
@@ -51,12 +74,25 @@ def extract_if_needed(
             if dest.exists():
                 dest = target / f"{dest.stem}_copy{dest.suffix}"
             shutil.copy(stored_path, dest)
+        if key:
+            try:
+                marker.write_text(key, encoding="utf-8")
+            except OSError:
+                pass
         return target
     except Exception:
-        shutil.rmtree(target, ignore_errors=True)
+        remove_tree(target)
         raise
 
 
+def _extract_key(stored_path: Path, original_filename: str | None) -> str | None:
+    try:
+        st = stored_path.stat()
+    except OSError:
+        return None
+    return f"{stored_path.name}:{st.st_size}:{st.st_mtime_ns}:{original_filename or ''}"
+
+
 def _safe_filename(name: str | None) -> str:
     if not name:
         return "upload"
@@ -105,6 +141,78 @@ def _safe_extract_rar(rf, target_dir: Path) -> None:
     rf.extractall(str(target_dir))
 
 
+class _ExtractBudget:
+    """Running total of bytes written across (possibly concurrent) member extractions."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._total = 0
+
+    def add(self, n: int) -> None:
+        with self._lock:
+            self._total += n
+            total = self._total
+        if MAX_EXTRACT_BYTES and total > MAX_EXTRACT_BYTES:
+            raise ValueError("Archive uncompressed size too large to extract")
+
+
+def _extract_zip_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, dest: Path, budget: _ExtractBudget) -> None:
+    written_file = 0
+    with zf.open(info, "r") as src, open(dest, "wb") as dst:
+        while True:
+            chunk = src.read(_EXTRACT_CHUNK_BYTES)
+            if not chunk:
+                break
+            written_file += len(chunk)
+            if MAX_EXTRACT_FILE_BYTES and written_file > MAX_EXTRACT_FILE_BYTES:
+                raise ValueError("Archive contains a file too large to extract")
+            budget.add(len(chunk))
+            dst.write(chunk)
+
+
+def _extract_zip_members_parallel(
+    zip_path: Path,
+    members: list[tuple[zipfile.ZipInfo, Path]],
+    budget: _ExtractBudget,
+    workers: int,
+) -> None:
+    # ZipFile keeps a shared file position, so every worker thread opens its own handle.
+    local = threading.local()
+    handles: list[zipfile.ZipFile] = []
+    handles_lock = threading.Lock()
+    failed = threading.Event()
+
+    def _handle() -> zipfile.ZipFile:
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = zipfile.ZipFile(zip_path, "r")
+            local.zf = zf
+            with handles_lock:
+                handles.append(zf)
+        return zf
+
+    def _extract(info: zipfile.ZipInfo, dest: Path) -> None:
+        if failed.is_set():
+            return
+        try:
+            _extract_zip_member(_handle(), info, dest, budget)
+        except Exception:
+            failed.set()
+            raise
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kicomport-unzip") as pool:
+            futures = [pool.submit(_extract, info, dest) for info, dest in members]
+            for future in futures:
+                future.result()
+    finally:
+        for zf in handles:
+            try:
+                zf.close()
+            except Exception:
+                pass
+
+
 def _safe_extract_zip(zip_path: Path, target_dir: Path) -> None:
     """Extract a zip while preventing path traversal and limiting extraction size."""
     with zipfile.ZipFile(zip_path, "r") as zf:
@@ -120,24 +228,25 @@ def _safe_extract_zip(zip_path: Path, target_dir: Path) -> None:
         max_file = max((int(getattr(info, "file_size", 0) or 0) for info in infos), default=0)
         _enforce_extract_limits(file_count=len(infos), total_bytes=total_bytes, max_file_bytes=max_file)
 
-        written_total = 0
+        # Validate every member up front; a repeated name keeps its last entry, as sequential extraction would.
+        by_dest: dict[Path, tuple[zipfile.ZipInfo, Path]] = {}
         for info in infos:
-            member = _safe_zip_member(info.filename, target_dir)
-            dest = target_dir / member
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            written_file = 0
-            with zf.open(info, "r") as src, open(dest, "wb") as dst:
-                while True:
-                    chunk = src.read(8192)
-                    if not chunk:
-                        break
-                    written_file += len(chunk)
-                    written_total += len(chunk)
-                    if MAX_EXTRACT_FILE_BYTES and written_file > MAX_EXTRACT_FILE_BYTES:
-                        raise ValueError("Archive contains a file too large to extract")
-                    if MAX_EXTRACT_BYTES and written_total > MAX_EXTRACT_BYTES:
-                        raise ValueError("Archive uncompressed size too large to extract")
-                    dst.write(chunk)
+            dest = target_dir / _safe_zip_member(info.filename, target_dir)
+            by_dest.pop(dest, None)
+            by_dest[dest] = (info, dest)
+        members = list(by_dest.values())
+        # Create each distinct parent once (shallowest first) instead of a mkdir per member.
+        for parent in sorted({dest.parent for dest in by_dest}, key=lambda p: len(p.parts)):
+            parent.mkdir(parents=True, exist_ok=True)
+
+        budget = _ExtractBudget()
+        workers = min(EXTRACT_WORKERS, len(members))
+        if workers <= 1 or len(members) < _PARALLEL_EXTRACT_MIN_FILES:
+            for info, dest in members:
+                _extract_zip_member(zf, info, dest, budget)
+            return
+
+    _extract_zip_members_parallel(zip_path, members, budget, workers)
 
 
 def _safe_members(names: Iterable[str], target_dir: Path) -> list[Path]:
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Tuple
+
+
+def mkstemp_beside(path: Path) -> Tuple[int, str]:
+    """mkstemp in `path`'s folder; the folder is only created (mkdir syscalls) when it is missing."""
+    try:
+        return tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
+
+
+def atomic_write(path: Path, content: str | bytes, *, durable: bool = True) -> None:
+    fd, tmp_path = mkstemp_beside(path)
+    try:
+        with (os.fdopen(fd, "wb") if isinstance(content, bytes) else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except Exception:
+            pass
+
+
+@contextmanager
+def mapped(path: Path):
+    """Read-only view of a file's bytes (mmap when possible, e.g. not for empty files)."""
+    with open(path, "rb") as f:
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            yield f.read()
+            return
+        try:
+            yield view
+        finally:
+            view.close()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import errno
+import filecmp
+import hashlib
+import json
 import os
 import re
 import shutil
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -16,20 +22,40 @@ except Exception:  # pragma: no cover
     fcntl = None
 
 from ..db.models import CandidateFile, CandidateType, Component, Job, JobStatus
+from .fileio import atomic_write, mapped, mkstemp_beside
 from .ranking import apply_feedback
-from .jobs import log_job, update_status
+from .jobs import job_log_batch, log_job, update_status
 
 DEFAULT_SUBFOLDER = "~KiComport"
 SYMBOL_HEADER = "(kicad_symbol_lib (version 20211014) (generator kicomport)\n"
 KNOWN_RENAME_EXTS = (".kicad_mod", ".step", ".stp", ".wrl", ".obj", ".kicad_sym")
+IMPORT_WORKERS = int(os.getenv("KICOMPORT_IMPORT_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
 
 @contextmanager
 def _file_lock(lock_path: Path):
-    if fcntl is None:
-        yield
-        return
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(lock_path, "a", encoding="utf-8") as lock_file:
+    # flock coordinates processes; the per-path thread lock also covers platforms without fcntl.
+    with _THREAD_LOCKS_GUARD:
+        thread_lock = _THREAD_LOCKS.setdefault(str(lock_path), threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with _flock(lock_path):
+            yield
+
+
+@contextmanager
+def _flock(lock_path: Path):
+    try:
+        lock_file = open(lock_path, "a", encoding="utf-8")
+    except FileNotFoundError:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a", encoding="utf-8")
+    with lock_file:
         fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
         try:
             yield
@@ -37,28 +63,81 @@ def _file_lock(lock_path: Path):
             fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
 
-def _atomic_write(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", dir=str(path.parent))
+def _fsync_file_and_dir(path: Path) -> None:
+    """Flush a file's data and its directory entry (used once after a batch of non-durable writes)."""
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            f.write(content)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, path)
-    finally:
+        fd = os.open(path, os.O_RDONLY)
         try:
-            os.unlink(tmp_path)
-        except Exception:
-            pass
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    except OSError:
+        pass
+
+
+_COPY_BUFSIZE = 1 << 20  # 1 MiB: fewer read/write round-trips for large STEP/WRL models
+# copy_file_range/sendfile decline with these when the filesystems or file types don't support them.
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+
+def _copy_fd(src_fd: int, dest_fd: int, size: int) -> None:
+    """
+    Copy `size` bytes between two fds, kernel-side where possible.
+
+    `copy_file_range` lets the filesystem clone or server-side copy (btrfs/XFS reflinks, NFS), then
+    `sendfile`, then a plain read/write loop with a large buffer.
+    """
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                n = os.copy_file_range(src_fd, dest_fd, size - offset)
+                if n == 0:
+                    break
+                offset += n
+        except OSError as exc:
+            if exc.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    if offset < size and hasattr(os, "sendfile"):
+        try:
+            while offset < size:
+                n = os.sendfile(dest_fd, src_fd, offset, size - offset)
+                if n == 0:
+                    break
+                offset += n
+        except OSError as exc:
+            if exc.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dest_fd, offset, os.SEEK_SET)
+    while True:
+        chunk = os.read(src_fd, _COPY_BUFSIZE)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dest_fd, view) :]
 
 
 def _atomic_copy(src: Path, dest: Path) -> None:
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(prefix=dest.name + ".", dir=str(dest.parent))
+    fd, tmp_path = mkstemp_beside(dest)
     try:
-        os.close(fd)
-        shutil.copy2(src, tmp_path)
+        # Copy straight into the temp file's fd instead of reopening it by name.
+        try:
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                _copy_fd(src_fd, fd, os.fstat(src_fd).st_size)
+            finally:
+                os.close(src_fd)
+        finally:
+            os.close(fd)
+        shutil.copystat(src, tmp_path)
         os.replace(tmp_path, dest)
     finally:
         try:
@@ -73,10 +152,13 @@ def _next_available_copy(dest: Path) -> Path:
     base = dest.stem
     suffix = dest.suffix
     parent = dest.parent
+    # One directory listing instead of a stat per probed name.
+    with os.scandir(parent) as it:
+        existing = {entry.name for entry in it}
     for i in range(1, 10_000):
-        candidate = parent / f"{base}_copy{i}{suffix}"
-        if not candidate.exists():
-            return candidate
+        name = f"{base}_copy{i}{suffix}"
+        if name not in existing:
+            return parent / name
     raise RuntimeError(f"Could not find available destination for {dest}")
 
 
@@ -88,9 +170,26 @@ def import_job_selection(
     model_dir: Path,
     subfolder: str = DEFAULT_SUBFOLDER,
     rename_to: str | None = None,
+    symbol_index_dir: Path | None = None,
+) -> Tuple[Dict[str, int], List[str]]:
+    # Every log line of the import (including the final status message) is inserted in one batch;
+    # candidate counters go out as one executemany UPDATE with the session's next flush.
+    with job_log_batch(db):
+        return _import_job_selection(db, job, symbol_dir, footprint_dir, model_dir, subfolder, rename_to, symbol_index_dir)
+
+
+def _import_job_selection(
+    db: Session,
+    job: Job,
+    symbol_dir: Path,
+    footprint_dir: Path,
+    model_dir: Path,
+    subfolder: str = DEFAULT_SUBFOLDER,
+    rename_to: str | None = None,
+    symbol_index_dir: Path | None = None,
 ) -> Tuple[Dict[str, int], List[str]]:
     if job.status not in {JobStatus.waiting_for_import, JobStatus.waiting_for_user}:
-        log_job(db, job, f"Import triggered from status {job.status.value}", level="WARNING")
+        log_job(db, job, "Import triggered from status %s", job.status.value, level="WARNING")
     copied = {"symbols": 0, "footprints": 0, "models": 0}
     destinations: list[str] = []
 
@@ -103,144 +202,330 @@ def import_job_selection(
     footprint_dir = footprint_dir / f"{safe_sub}.pretty"
     model_dir = model_dir / safe_sub
 
+    # Resolve selections up front on this thread; the session is not shared with the copy workers.
+    plans = []
     for comp in job.components:
-        count, model_dest = _copy_if_selected(
-            db, comp, comp.selected_model_id, CandidateType.model, model_dir, rename_to=safe_rename or None
-        )
-        copied["models"] += count
-        if model_dest:
-            destinations.append(str(model_dest))
-
-        count, fp_dest = _copy_if_selected(
-            db,
-            comp,
-            comp.selected_footprint_id,
-            CandidateType.footprint,
-            footprint_dir,
-            rename_to=safe_rename or None,
-            model_dest=model_dest,
+        by_id = {c.id: c for c in comp.candidates}
+        symbol = _selected_candidate(db, comp, comp.selected_symbol_id, CandidateType.symbol, candidates=by_id)
+        model = _selected_candidate(db, comp, comp.selected_model_id, CandidateType.model, candidates=by_id)
+        footprint = _selected_candidate(db, comp, comp.selected_footprint_id, CandidateType.footprint, candidates=by_id)
+        plans.append(
+            (
+                comp,
+                symbol,
+                _destination_for(symbol, symbol_dir, rename_to=safe_rename or None) if symbol else None,
+                model,
+                _destination_for(model, model_dir, rename_to=safe_rename or None) if model else None,
+                footprint,
+                _destination_for(footprint, footprint_dir, rename_to=safe_rename or None) if footprint else None,
+            )
         )
-        copied["footprints"] += count
-        if fp_dest:
-            destinations.append(str(fp_dest))
 
-        count, sym_dest = _copy_if_selected(
-            db, comp, comp.selected_symbol_id, CandidateType.symbol, symbol_dir, rename_to=safe_rename or None
-        )
-        copied["symbols"] += count
-        if sym_dest:
-            destinations.append(str(sym_dest))
+    def _place_component(model_src, model_dest, footprint_src, footprint_dest):
+        if model_dest:
+            model_dest = _place_file(CandidateType.model, model_src, model_dest, model_dir, rename_to=safe_rename or None)
+        if footprint_dest:
+            footprint_dest = _place_file(
+                CandidateType.footprint,
+                footprint_src,
+                footprint_dest,
+                footprint_dir,
+                rename_to=safe_rename or None,
+                model_dest=model_dest,
+            )
+        return model_dest, footprint_dest
+
+    # Footprint/model copies fan out across components. A rename sends every component to the
+    # same file names, so that case stays sequential to keep "last component wins" ordering.
+    workers = 1 if safe_rename else min(IMPORT_WORKERS, len(plans))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kicomport-import") if workers > 1 else None
+    symbol_libs: set[Path] = set()
+    imported: List[CandidateFile] = []
+    try:
+        placements = []
+        for _, _, _, model, model_dest, footprint, footprint_dest in plans:
+            args = (
+                Path(model.path) if model else None,
+                model_dest,
+                Path(footprint.path) if footprint else None,
+                footprint_dest,
+            )
+            placements.append(pool.submit(_place_component, *args) if pool else args)
+
+        # Symbols all merge into one library file: each library is read and appended/rewritten once for
+        # the whole job, on this thread while the pool copies. Fsyncs are deferred to one per library.
+        symbol_batches: Dict[Path, List[Tuple[Component, CandidateFile]]] = {}
+        for comp, symbol, sym_dest, *_ in plans:
+            if symbol and sym_dest:
+                symbol_batches.setdefault(sym_dest, []).append((comp, symbol))
+        for sym_dest, items in symbol_batches.items():
+            symbol_libs.add(sym_dest)
+            copied["symbols"] += _import_symbols(
+                db, items, sym_dest, rename_to=safe_rename or None, durable=False, index_dir=symbol_index_dir
+            )
+            destinations.extend(str(sym_dest) for _ in items)
+            imported.extend(candidate for _, candidate in items)
+
+        for (comp, _, _, model, _, footprint, _), placement in zip(plans, placements):
+            model_dest, fp_dest = placement.result() if pool else _place_component(*placement)
+            if model and model_dest:
+                _record_import(db, comp, model, model_dest)
+                imported.append(model)
+                copied["models"] += 1
+                destinations.append(str(model_dest))
+            if footprint and fp_dest:
+                _record_import(db, comp, footprint, fp_dest)
+                imported.append(footprint)
+                copied["footprints"] += 1
+                destinations.append(str(fp_dest))
+    finally:
+        if pool:
+            pool.shutdown(wait=True)
+        for lib in symbol_libs:
+            _fsync_file_and_dir(lib)
+    _apply_import_feedback(db, imported)
 
     total_copied = copied["symbols"] + copied["footprints"] + copied["models"]
     if total_copied == 0:
         log_job(db, job, "Import skipped: no selections to copy", level="WARNING")
     elif destinations:
-        log_job(db, job, f"Imported files: {', '.join(destinations)}")
+        log_job(db, job, "Imported files: %s", ", ".join(destinations))
 
     update_status(db, job, JobStatus.imported if total_copied else JobStatus.waiting_for_import, "Import completed" if total_copied else "No selections to import")
     return copied, destinations
 
 
-def _copy_if_selected(
+def _selected_candidate(
     db: Session,
     comp: Component,
     candidate_id: int | None,
     expected_type: CandidateType,
-    target_root: Path,
-    rename_to: str | None = None,
-    model_dest: Path | None = None,
-) -> Tuple[int, Optional[Path]]:
+    *,
+    candidates: Dict[int, CandidateFile] | None = None,
+) -> Optional[CandidateFile]:
     if not candidate_id:
-        return 0, None
-    candidate: CandidateFile = next((c for c in comp.candidates if c.id == candidate_id), None)
+        return None
+    if candidates is not None:
+        candidate = candidates.get(candidate_id)
+    else:
+        candidate = next((c for c in comp.candidates if c.id == candidate_id), None)
     if not candidate or candidate.type != expected_type:
-        log_job(db, comp.job, f"Candidate {candidate_id} missing or wrong type {expected_type.value}", level="WARNING")
-        return 0, None
-    src = Path(candidate.path)
-    dest = _destination_for(candidate, target_root, rename_to=rename_to)
+        log_job(db, comp.job, "Candidate %s missing or wrong type %s", candidate_id, expected_type.value, level="WARNING")
+        return None
+    return candidate
+
+
+def _record_import(db: Session, comp: Component, candidate: CandidateFile, dest: Path) -> None:
+    log_job(db, comp.job, "Imported %s %s to %s", candidate.type.value, candidate.name, dest)
+
+
+def _apply_import_feedback(db: Session, candidates: List[CandidateFile]) -> None:
+    """Count each imported candidate once and rescore it; the session flushes these as one executemany UPDATE."""
+    seen: set[int] = set()
+    for candidate in candidates:
+        if candidate.id in seen:
+            continue
+        seen.add(candidate.id)
+        candidate.selected_count = (candidate.selected_count or 0) + 1
+        apply_feedback(candidate)
+
+
+def _import_symbols(
+    db: Session,
+    items: List[Tuple[Component, CandidateFile]],
+    dest: Path,
+    *,
+    rename_to: str | None = None,
+    durable: bool = True,
+    index_dir: Path | None = None,
+) -> int:
+    """Merge selected symbol candidates into one library under its lock; returns symbols added."""
     dest.parent.mkdir(parents=True, exist_ok=True)
-    if candidate.type == CandidateType.symbol:
-        lock_path = dest.with_name(dest.name + ".lock")
-        with _file_lock(lock_path):
-            merged = _merge_symbol_lib(src, dest, rename_to=rename_to, source_symbol_hint=candidate.name)
-        log_job(
-            db,
-            comp.job,
-            f"Imported symbol {candidate.name}{f' as {rename_to}' if rename_to else ''} into {dest}",
+    lock_path = dest.with_name(dest.name + ".lock")
+    with _file_lock(lock_path):
+        counts = _merge_symbol_libs(
+            [(Path(candidate.path), candidate.name) for _, candidate in items],
+            dest,
+            rename_to=rename_to,
+            durable=durable,
+            index_dir=index_dir,
         )
-        candidate.selected_count += 1
-        apply_feedback(candidate)
-        db.add(candidate)
-        return merged, dest
+    for comp, candidate in items:
+        log_job(db, comp.job, "Imported symbol %s%s into %s", candidate.name, f" as {rename_to}" if rename_to else "", dest)
+    return sum(counts)
+
+
+def _place_file(
+    file_type: CandidateType,
+    src: Path,
+    dest: Path,
+    target_root: Path,
+    *,
+    rename_to: str | None = None,
+    model_dest: Path | None = None,
+) -> Path:
+    """
+    Copy a footprint/model into the library folder and return where it landed.
 
+    Touches only the filesystem, so it is safe to run on worker threads. The folder lock is held just
+    long enough to pick and reserve a free `_copyN` name; the copy itself runs unlocked.
+    Folders are created on first use rather than re-checked for every file.
+    """
     lock_path = target_root / ".kicomport.lock"
     with _file_lock(lock_path):
-        if not rename_to:
-            dest = _next_available_copy(dest)
-        if candidate.type == CandidateType.footprint:
-            text = src.read_text(encoding="utf-8", errors="ignore")
+        if rename_to:
+            _write_library_file(file_type, src, dest, model_dest)
+            return dest
+        # Re-importing the same file would otherwise pile up `_copyN` duplicates.
+        if _already_in_place(file_type, src, dest, model_dest):
+            return dest
+        dest = _next_available_copy(dest)
+        try:
+            fd = os.open(dest, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileNotFoundError:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(dest, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        os.close(fd)
+    try:
+        _write_library_file(file_type, src, dest, model_dest)
+    except Exception:
+        try:
+            dest.unlink()
+        except OSError:
+            pass
+        raise
+    return dest
+
+
+def _render_footprint(src: Path, dest: Path, model_dest: Path | None) -> str:
+    text = src.read_text(encoding="utf-8", errors="ignore")
+    model_rel = None
+    if model_dest:
+        try:
+            model_rel = os.path.relpath(model_dest, start=dest.parent)
+        except Exception:
             model_rel = None
-            if model_dest:
-                try:
-                    model_rel = os.path.relpath(model_dest, start=dest.parent)
-                except Exception:
-                    model_rel = None
-            rewritten = _rewrite_footprint(text, new_name=dest.stem, model_path=model_rel)
-            _atomic_write(dest, rewritten)
-        else:
-            _atomic_copy(src, dest)
-    log_job(db, comp.job, f"Imported {expected_type.value} {candidate.name} to {dest}")
-    candidate.selected_count += 1
-    apply_feedback(candidate)
-    db.add(candidate)
-    return 1, dest
+    return _rewrite_footprint(text, new_name=dest.stem, model_path=model_rel)
 
 
-def _destination_for(candidate: CandidateFile, target_root: Path, rename_to: str | None = None) -> Path:
-    rel = Path(candidate.rel_path) if candidate.rel_path else Path("")
-    fallback_filename = rel.name or Path(candidate.path).name or f"{candidate.name}.kicad_mod"
+def _write_library_file(file_type: CandidateType, src: Path, dest: Path, model_dest: Path | None) -> None:
+    if file_type == CandidateType.footprint:
+        atomic_write(dest, _render_footprint(src, dest, model_dest))
+    else:
+        _atomic_copy(src, dest)
+
+
+def _already_in_place(file_type: CandidateType, src: Path, dest: Path, model_dest: Path | None) -> bool:
+    """True when `dest` already holds exactly what importing `src` there would write."""
+    try:
+        dest_stat = dest.stat()
+        if file_type == CandidateType.footprint:
+            return dest.read_bytes() == _render_footprint(src, dest, model_dest).encode("utf-8")
+        if os.path.samestat(os.stat(src), dest_stat):
+            return True
+        # Size first, so differing models are rejected without reading them.
+        return os.path.getsize(src) == dest_stat.st_size and filecmp.cmp(src, dest, shallow=False)
+    except OSError:
+        return False
+
+
+def _path_name(path: str) -> str:
+    """`Path(path).name` for a POSIX-style path string, without building a Path."""
+    path = os.fspath(path)
+    name = os.path.basename(path)
+    if name and name != ".":
+        return name
+    # Trailing separators or "." segments: Path drops those, so take the last real segment.
+    return next((part for part in reversed(path.split(os.sep)) if part and part != "."), "")
+
+
+def _path_suffix(name: str) -> str:
+    ext = os.path.splitext(name)[1]
+    return "" if ext == "." else ext
+
+
+def _symbol_destination(candidate: CandidateFile, target_root: Path, rename_to: str | None) -> Path:
+    # Every symbol merges into the single shared library.
+    return target_root / (DEFAULT_SUBFOLDER + ".kicad_sym")
+
+
+def _footprint_destination(candidate: CandidateFile, target_root: Path, rename_to: str | None) -> Path:
+    # Footprints flatten into the destination .pretty library folder.
     rename_clean = _safe_basename(_strip_known_ext(rename_to)) if rename_to else ""
+    if rename_clean:
+        return target_root / f"{rename_clean}.kicad_mod"
+    rel_name = _path_name(candidate.rel_path) if candidate.rel_path else ""
+    return target_root / (rel_name or _path_name(candidate.path) or f"{candidate.name}.kicad_mod")
+
+
+def _model_destination(candidate: CandidateFile, target_root: Path, rename_to: str | None) -> Path:
+    rel = os.fspath(candidate.rel_path) if candidate.rel_path else ""
+    rel_name = _path_name(rel) if rel else ""
+    rename_clean = _safe_basename(_strip_known_ext(rename_to)) if rename_to else ""
+    if rename_clean:
+        ext = _path_suffix(_path_name(candidate.path)).lower()
+        if not ext and rel_name:
+            ext = _path_suffix(rel_name).lower()
+        return target_root / f"{rename_clean}{ext}"
+    # Fallback when relative path is missing/empty; otherwise keep the archive's relative layout.
+    if not rel_name:
+        return target_root / (_path_name(candidate.path) or f"{candidate.name}.kicad_mod")
+    return target_root / rel
+
+
+_DESTINATION_BY_TYPE = {
+    CandidateType.symbol: _symbol_destination,
+    CandidateType.footprint: _footprint_destination,
+    CandidateType.model: _model_destination,
+}
+
+
+def _destination_for(candidate: CandidateFile, target_root: Path, rename_to: str | None = None) -> Path:
+    # Plain string/os.path work on the candidate's paths; only the returned destination is a Path.
+    resolve = _DESTINATION_BY_TYPE.get(candidate.type)
+    if resolve is None:
+        return target_root / (candidate.name + ".kicad_sym")
+    return resolve(candidate, target_root, rename_to)
+
+
+def _ascii_table(keep: str, *, space_to: str | None = None) -> dict[int, str | None]:
+    table: dict[int, str | None] = {}
+    for code in range(128):
+        ch = chr(code)
+        if ch.isalnum() or ch in keep:
+            table[code] = ch
+        elif space_to is not None and ch.isspace():
+            table[code] = space_to
+        else:
+            table[code] = None
+    return table
 
-    # Fallback when relative path is missing/empty
-    if not rel.name:
-        if candidate.type == CandidateType.footprint:
-            if rename_clean:
-                return target_root / f"{rename_clean}.kicad_mod"
-            return target_root / fallback_filename
-        if candidate.type == CandidateType.model:
-            if rename_clean:
-                ext = Path(candidate.path).suffix.lower()
-                return target_root / f"{rename_clean}{ext}"
-            return target_root / fallback_filename
-        if candidate.type == CandidateType.symbol:
-            return target_root / (DEFAULT_SUBFOLDER + ".kicad_sym")
-
-    # For footprints flatten into the destination .pretty library folder.
-    if candidate.type == CandidateType.footprint:
-        if rename_clean:
-            return target_root / f"{rename_clean}.kicad_mod"
-        return target_root / fallback_filename
-    if candidate.type == CandidateType.model:
-        if rename_clean:
-            ext = Path(candidate.path).suffix.lower() or rel.suffix.lower()
-            return target_root / f"{rename_clean}{ext}"
-        return target_root / rel
-    # Preserve relative path for symbols to avoid flattening collisions
-    if candidate.type == CandidateType.symbol:
-        return target_root / (DEFAULT_SUBFOLDER + ".kicad_sym")
-    return target_root / (candidate.name + ".kicad_sym")
 
+# str.translate tables for the common all-ASCII case; non-ASCII names keep the per-char path,
+# since isalnum() accepts Unicode letters/digits.
+_SEGMENT_TABLE = _ascii_table("-_~")
+_BASENAME_TABLE = _ascii_table("-_~.+", space_to="_")
 
+
+# Import sanitizes the same subfolder/rename value for every candidate; memoize the few distinct inputs.
+@lru_cache(maxsize=256)
 def _safe_segment(name: str) -> str:
-    cleaned = "".join(ch for ch in name if ch.isalnum() or ch in "-_~").strip("-_")
+    if name.isascii():
+        cleaned = name.translate(_SEGMENT_TABLE).strip("-_")
+    else:
+        cleaned = "".join(ch for ch in name if ch.isalnum() or ch in "-_~").strip("-_")
     return cleaned or DEFAULT_SUBFOLDER
 
 
+@lru_cache(maxsize=256)
 def _safe_basename(name: str | None) -> str:
     if not name:
         return ""
+    text = str(name).strip()
+    if text.isascii():
+        return text.translate(_BASENAME_TABLE).strip("-_")
     buf: list[str] = []
-    for ch in str(name).strip():
+    for ch in text:
         if ch.isalnum() or ch in "-_~.+":
             buf.append(ch)
         elif ch.isspace():
@@ -286,6 +571,10 @@ def _rewrite_footprint(text: str, *, new_name: str, model_path: str | None = Non
     return text
 
 
+_RENAME_QUOTED_RE = re.compile(r'\(symbol\s+"([^"]+)"')
+_RENAME_BARE_RE = re.compile(r'\(symbol\s+([^\s()"]+)')
+
+
 def _rename_symbol_block(symbol_block: str, new_name: str) -> str:
     """Rename a KiCad symbol block (top-level and nested units) to a new base name."""
     old_name = _symbol_name(symbol_block)
@@ -312,19 +601,178 @@ def _rename_symbol_block(symbol_block: str, new_name: str) -> str:
             updated = name
         return match.group(0).replace(name, updated, 1)
 
-    out = re.sub(r'\(symbol\s+"([^"]+)"', _quoted, symbol_block)
-    out = re.sub(r'\(symbol\s+([^\s()"]+)', _bare, out)
+    out = _RENAME_QUOTED_RE.sub(_quoted, symbol_block)
+    out = _RENAME_BARE_RE.sub(_bare, out)
     return out
 
 
-def _merge_symbol_lib(src: Path, dest: Path, *, rename_to: str | None = None, source_symbol_hint: str | None = None) -> int:
+def _symbol_index_path(dest: Path, index_dir: Path | None) -> Path | None:
+    """Sidecar for `dest` inside the app's own data (never next to the user's KiCad library)."""
+    if index_dir is None:
+        return None
+    key = hashlib.md5(str(dest.absolute()).encode("utf-8")).hexdigest()
+    return index_dir / f"{key}.json"
+
+
+def _write_symbol_index(dest: Path, names: List[str], close_offset: int, index_dir: Path | None) -> None:
+    index_path = _symbol_index_path(dest, index_dir)
+    if index_path is None:
+        return
+    try:
+        st = dest.stat()
+        payload = {
+            "library": str(dest),
+            "names": names,
+            "close_offset": close_offset,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+        }
+        # Rebuildable cache (validated against the library's mtime/size), so never worth an fsync.
+        atomic_write(index_path, json.dumps(payload), durable=False)
+    except Exception:
+        pass
+
+
+def _load_symbol_index(dest: Path, index_dir: Path | None) -> dict | None:
+    """
+    Return `{"names": [...], "close_offset": N}` for a symbol library.
+
+    The sidecar is trusted only while the library's mtime/size match what was recorded, so edits made
+    outside KiComport (e.g. from KiCad's symbol editor) force a one-off rescan.
+    """
+    index_path = _symbol_index_path(dest, index_dir)
+    try:
+        st = dest.stat()
+        if index_path is not None:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("mtime_ns") == st.st_mtime_ns and index.get("size") == st.st_size:
+                return index
+    except Exception:
+        pass
+    try:
+        with mapped(dest) as data:
+            close_offset = len(data) - 1
+            while close_offset >= 0 and data[close_offset : close_offset + 1] in b" \t\n\r\x0b\x0c":
+                close_offset -= 1
+            if close_offset < 0 or data[close_offset : close_offset + 1] != b")":
+                return None
+            names = [_symbol_name(sym) for sym in _extract_symbols(data)]
+    except OSError:
+        return None
+    _write_symbol_index(dest, names, close_offset, index_dir)
+    return {"names": names, "close_offset": close_offset}
+
+
+def _append_symbols(dest: Path, symbols: List[bytes], close_offset: int, *, durable: bool = True) -> int:
+    """
+    Insert symbol blocks before the library's closing paren; returns the new close offset.
+
+    The existing content is copied byte-for-byte (not reparsed) into a temp file that replaces the
+    library atomically, so a crash or full disk never leaves a half-written library behind.
+    """
+    with mapped(dest) as data:
+        head = data[:close_offset]
+    prefix = b"" if close_offset > 0 and head[-1:] == b"\n" else b"\n"
+    body = prefix + b"\n".join(symbols) + b"\n"
+    atomic_write(dest, head + body + b")", durable=durable)
+    return close_offset + len(body)
+
+
+def _write_symbol_lib(
+    dest: Path, named: List[Tuple[str, bytes]], *, durable: bool = True, index_dir: Path | None = None
+) -> None:
+    content = SYMBOL_HEADER.encode("utf-8") + b"\n".join(sym for _, sym in named) + b"\n)"
+    atomic_write(dest, content, durable=durable)
+    _write_symbol_index(dest, [name for name, _ in named], len(content) - 1, index_dir)
+
+
+def _new_symbols(named: List[Tuple[str, bytes]], existing_names: set[str]) -> List[Tuple[str, bytes]]:
+    added: List[Tuple[str, bytes]] = []
+    for name, sym in named:
+        if name and name not in existing_names:
+            added.append((name, sym))
+            existing_names.add(name)
+    return added
+
+
+def _merge_symbol_lib(
+    src: Path,
+    dest: Path,
+    *,
+    rename_to: str | None = None,
+    source_symbol_hint: str | None = None,
+    durable: bool = True,
+    index_dir: Path | None = None,
+) -> int:
     """
     Merge symbols from src library into dest library file.
     Returns count of symbols added (duplicates by name are skipped).
     """
+    return _merge_symbol_libs(
+        [(src, source_symbol_hint)], dest, rename_to=rename_to, durable=durable, index_dir=index_dir
+    )[0]
+
+
+def _merge_symbol_libs(
+    sources: List[Tuple[Path, str | None]],
+    dest: Path,
+    *,
+    rename_to: str | None = None,
+    durable: bool = True,
+    index_dir: Path | None = None,
+) -> List[int]:
+    """
+    Merge several `(src, source_symbol_hint)` libraries into dest in order, reading and writing dest once.
+    Returns the count of symbols added per source; a later source wins when a rename replaces a name.
+
+    Plain additions are spliced in before the closing paren using the sidecar index kept under
+    `index_dir` (existing symbol names + offset of the closing paren), so the destination library is
+    not reparsed per import. Without `index_dir` the library is scanned each time.
+    Callers hold the library's `_file_lock`. With `durable=False` writes skip fsync and the caller is
+    expected to flush the library once (see `_fsync_file_and_dir`).
+    """
+    prepared = [_source_symbols(src, rename_to=rename_to, source_symbol_hint=hint) for src, hint in sources]
+    if not dest.exists():
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        named: List[Tuple[str, bytes]] = []
+        counts = _apply_symbol_sources(named, prepared)
+        _write_symbol_lib(dest, named, durable=durable, index_dir=index_dir)
+        return counts
+
+    index = _load_symbol_index(dest, index_dir)
+    if index is not None:
+        names = set(index["names"])
+        appended: List[Tuple[str, bytes]] = []
+        counts = []
+        for new_named, removed_names in prepared:
+            if removed_names & names:
+                break
+            added = _new_symbols(new_named, names)
+            appended.extend(added)
+            counts.append(len(added))
+        else:
+            if appended:
+                close_offset = _append_symbols(
+                    dest, [sym for _, sym in appended], int(index["close_offset"]), durable=durable
+                )
+                _write_symbol_index(dest, [*index["names"], *(name for name, _ in appended)], close_offset, index_dir)
+            return counts
+
+    # Replacing renamed symbols (or an unreadable library) needs a full rewrite.
+    # Existing blocks are sliced straight out of the mapped file; the library is never decoded whole.
+    with mapped(dest) as existing:
+        named = [(_symbol_name(sym), sym) for sym in _extract_symbols(existing)]
+    counts = _apply_symbol_sources(named, prepared)
+    _write_symbol_lib(dest, named, durable=durable, index_dir=index_dir)
+    return counts
+
+
+def _source_symbols(
+    src: Path, *, rename_to: str | None, source_symbol_hint: str | None
+) -> Tuple[List[Tuple[str, bytes]], set[str]]:
+    """(name, utf-8 block) pairs to add from src, plus the names a rename replaces in the destination."""
     source_symbols = _extract_symbols(src.read_text(encoding="utf-8", errors="ignore"))
-    old_name_to_remove: str | None = None
-    did_rename = False
+    removed_names: set[str] = set()
     if rename_to:
         chosen: str | None = None
         if source_symbol_hint:
@@ -335,144 +783,103 @@ def _merge_symbol_lib(src: Path, dest: Path, *, rename_to: str | None = None, so
         if not chosen and len(source_symbols) == 1:
             chosen = source_symbols[0]
         if chosen:
-            old_name_to_remove = _symbol_name(chosen)
+            old_name = _symbol_name(chosen)
             source_symbols = [_rename_symbol_block(chosen, rename_to)]
-            did_rename = True
-    new_symbols = source_symbols
-    if not dest.exists():
-        content = SYMBOL_HEADER + "\n".join(new_symbols) + "\n)"
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        _atomic_write(dest, content)
-        return len(new_symbols)
-
-    existing_text = dest.read_text(encoding="utf-8", errors="ignore")
-    existing_symbols = _extract_symbols(existing_text)
-    if did_rename:
-        removed_names = {rename_to}
-        if old_name_to_remove and old_name_to_remove != rename_to:
-            removed_names.add(old_name_to_remove)
-        existing_symbols = [s for s in existing_symbols if _symbol_name(s) not in removed_names]
-    existing_names = {_symbol_name(s) for s in existing_symbols}
-    added = []
-    for sym in new_symbols:
-        name = _symbol_name(sym)
-        if name and name not in existing_names:
-            added.append(sym)
-            existing_names.add(name)
-    merged_symbols = existing_symbols + added
-    _atomic_write(dest, SYMBOL_HEADER + "\n".join(merged_symbols) + "\n)")
-    return len(added)
-
-
-def _extract_symbols(text: str) -> List[str]:
-    symbols: List[str] = []
+            removed_names = {rename_to}
+            if old_name and old_name != rename_to:
+                removed_names.add(old_name)
+    return [(_symbol_name(sym), sym.encode("utf-8")) for sym in source_symbols], removed_names
+
+
+def _apply_symbol_sources(
+    named: List[Tuple[str, bytes]], prepared: List[Tuple[List[Tuple[str, bytes]], set[str]]]
+) -> List[int]:
+    """Apply prepared sources to an in-memory library in order; returns symbols added per source."""
+    counts = []
+    for new_named, removed_names in prepared:
+        if removed_names:
+            named[:] = [(name, sym) for name, sym in named if name not in removed_names]
+        added = _new_symbols(new_named, {name for name, _ in named})
+        named.extend(added)
+        counts.append(len(added))
+    return counts
+
+
+# Strings (an unterminated one runs to EOF) and parens are all that matter for nesting; atoms are skipped in C.
+_SEXPR_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*(?:"|\\?\Z)|[()]', re.DOTALL)
+_SYMBOL_HEAD_RE = re.compile(r"\s*symbol(?![^\s()])")
+# Leading whitespace is consumed by the pattern so blocks are never copied just to lstrip them.
+_SYMBOL_NAME_RE = re.compile(r'\s*\(symbol\s*(?:"((?:\\.|[^"\\])*)|([^\s()]*))', re.DOTALL)
+_UNESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+# Bytes twins, so library files can be scanned from an mmap without decoding them.
+_SEXPR_TOKEN_RE_B = re.compile(_SEXPR_TOKEN_RE.pattern.encode(), re.DOTALL)
+_SYMBOL_HEAD_RE_B = re.compile(_SYMBOL_HEAD_RE.pattern.encode())
+_SYMBOL_NAME_RE_B = re.compile(_SYMBOL_NAME_RE.pattern.encode(), re.DOTALL)
+_UNESCAPE_RE_B = re.compile(_UNESCAPE_RE.pattern.encode(), re.DOTALL)
+
+
+def _extract_symbols(text):
+    """Top-level `(symbol ...)` blocks of a library; str in gives str out, bytes/mmap give bytes."""
+    if isinstance(text, str):
+        token_re, head_re, open_tok, close_tok = _SEXPR_TOKEN_RE, _SYMBOL_HEAD_RE, "(", ")"
+    else:
+        token_re, head_re, open_tok, close_tok = _SEXPR_TOKEN_RE_B, _SYMBOL_HEAD_RE_B, b"(", b")"
+    symbols = []
     depth = 0
-    in_string = False
-    escape = False
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if in_string:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == '"':
-                in_string = False
-            i += 1
-            continue
-
-        if ch == '"':
-            in_string = True
-            i += 1
-            continue
-
-        if ch == "(":
-            depth_before = depth
-            depth += 1
-            if depth_before == 1:
+    pos = 0
+    while True:
+        for match in token_re.finditer(text, pos):
+            tok = match.group()
+            if tok == close_tok:
+                depth = max(0, depth - 1)
+            elif tok == open_tok:
+                depth += 1
                 # candidate top-level entry in kicad_symbol_lib
-                j = i + 1
-                while j < len(text) and text[j].isspace():
-                    j += 1
-                atom_start = j
-                while j < len(text) and (not text[j].isspace()) and text[j] not in "()":
-                    j += 1
-                atom = text[atom_start:j]
-                if atom == "symbol":
-                    end = _find_matching_paren(text, i)
-                    if end != -1:
-                        symbols.append(text[i : end + 1])
-                        i = end + 1
-                        depth = depth_before
-                        continue
-            i += 1
-            continue
-
-        if ch == ")":
-            depth = max(0, depth - 1)
-            i += 1
-            continue
-
-        i += 1
-    return symbols
+                if depth == 2 and head_re.match(text, match.end()):
+                    end = _find_matching_paren(text, match.start())
+                    if end == -1:
+                        # Unbalanced tail: nothing after an unterminated symbol can be top-level.
+                        return symbols
+                    symbols.append(text[match.start() : end + 1])
+                    depth = 1
+                    pos = end + 1
+                    break
+        else:
+            return symbols
 
 
-def _find_matching_paren(text: str, start: int) -> int:
-    if start < 0 or start >= len(text) or text[start] != "(":
+def _find_matching_paren(text, start: int) -> int:
+    if isinstance(text, str):
+        token_re, open_tok, close_tok = _SEXPR_TOKEN_RE, "(", ")"
+    else:
+        token_re, open_tok, close_tok = _SEXPR_TOKEN_RE_B, b"(", b")"
+    if start < 0 or start >= len(text) or text[start : start + 1] != open_tok:
         return -1
     depth = 0
-    in_string = False
-    escape = False
-    for idx in range(start, len(text)):
-        ch = text[idx]
-        if in_string:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == '"':
-                in_string = False
-            continue
-        if ch == '"':
-            in_string = True
-            continue
-        if ch == "(":
+    for match in token_re.finditer(text, start):
+        tok = match.group()
+        if tok == open_tok:
             depth += 1
-        elif ch == ")":
+        elif tok == close_tok:
             depth -= 1
             if depth == 0:
-                return idx
+                return match.start()
     return -1
 
 
-def _symbol_name(symbol_block: str) -> str:
-    text = symbol_block.lstrip()
-    if not text.startswith("(symbol"):
+def _symbol_name(symbol_block: str | bytes) -> str:
+    if isinstance(symbol_block, bytes):
+        match = _SYMBOL_NAME_RE_B.match(symbol_block)
+        if not match:
+            return ""
+        quoted, bare = match.groups()
+        if quoted is not None:
+            return _UNESCAPE_RE_B.sub(rb"\1", quoted).decode("utf-8", errors="ignore").strip()
+        return bare.decode("utf-8", errors="ignore").strip()
+    match = _SYMBOL_NAME_RE.match(symbol_block)
+    if not match:
         return ""
-    i = len("(symbol")
-    while i < len(text) and text[i].isspace():
-        i += 1
-    if i >= len(text):
-        return ""
-    if text[i] == '"':
-        i += 1
-        buf: list[str] = []
-        esc = False
-        while i < len(text):
-            ch = text[i]
-            if esc:
-                buf.append(ch)
-                esc = False
-            elif ch == "\\":
-                esc = True
-            elif ch == '"':
-                break
-            else:
-                buf.append(ch)
-            i += 1
-        return "".join(buf).strip()
-    start = i
-    while i < len(text) and (not text[i].isspace()) and text[i] not in "()":
-        i += 1
-    return text[start:i].strip()
+    quoted, bare = match.groups()
+    if quoted is not None:
+        return _UNESCAPE_RE.sub(r"\1", quoted).strip()
+    return bare.strip()
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ..db.models import CandidateType, Component, Job, JobLog, JobStatus
 
 
-def log_job(db: Session, job: Job, message: str, level: str = "INFO") -> None:
-    entry = JobLog(job_id=job.id, level=level.upper(), message=message)
-    db.add(entry)
-    db.flush()
+_PENDING_LOGS_KEY = "kicomport_pending_job_logs"
+
+
+def log_job(db: Session, job: Job, message: str, *args: object, level: str = "INFO") -> None:
+    """
+    Record a log line for a job. The row is written with the session's next flush/commit, or when
+    the enclosing `job_log_batch` exits.
+
+    Like `logging`, `message` may be a %-format string with `args` applied here, once.
+    """
+    if args:
+        message = message % args
+    pending = db.info.get(_PENDING_LOGS_KEY)
+    if pending is not None:
+        pending.append({"job_id": job.id, "level": level.upper(), "message": message, "created_at": datetime.utcnow()})
+        return
+    db.add(JobLog(job_id=job.id, level=level.upper(), message=message))
+
+
+@contextmanager
+def job_log_batch(db: Session) -> Iterator[None]:
+    """
+    Collect `log_job` rows for the block and insert them with a single executemany on exit
+    (no ids are fetched back). Nested batches join the outer one; rows are dropped if the block raises.
+    """
+    if _PENDING_LOGS_KEY in db.info:
+        yield
+        return
+    pending: list[dict] = []
+    db.info[_PENDING_LOGS_KEY] = pending
+    try:
+        yield
+    finally:
+        db.info.pop(_PENDING_LOGS_KEY, None)
+    if pending:
+        db.execute(insert(JobLog), pending)
 
 
 def create_job(
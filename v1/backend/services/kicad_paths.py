@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import os
+import time
 from pathlib import Path
 
 from ..config import AppConfig
 
+# Ancestors recently shown not to contain `.config/kicad` are skipped for this long; KiCad (or
+# `clear_kicad_config_cache` after we create the folder ourselves) can make them valid later.
+_NEGATIVE_TTL_SEC = float(os.getenv("KICOMPORT_KICAD_CONFIG_NEGATIVE_TTL_SEC", "30"))
+_FOUND: dict[tuple, Path] = {}
+_MISSING: dict[Path, float] = {}
+
+
+def clear_kicad_config_cache() -> None:
+    _FOUND.clear()
+    _MISSING.clear()
+
 
 def find_kicad_config_dir(cfg: AppConfig | None) -> Path | None:
     """
@@ -11,6 +24,8 @@ def find_kicad_config_dir(cfg: AppConfig | None) -> Path | None:
 
     For LinuxServer KiCad this is usually:
     - `/config/.config/kicad`
+
+    A previous hit for the same configured dirs is reused after a single `is_dir()` check.
     """
     candidates: list[Path] = []
     if cfg:
@@ -23,6 +38,14 @@ def find_kicad_config_dir(cfg: AppConfig | None) -> Path | None:
         )
     candidates.extend([Path.home(), Path("/config"), Path("/KiCad/config")])
 
+    key = tuple(candidates)
+    cached = _FOUND.get(key)
+    if cached is not None:
+        if cached.is_dir():
+            return cached
+        _FOUND.pop(key, None)
+
+    now = time.monotonic()
     seen: set[Path] = set()
     for base in candidates:
         if base in seen:
@@ -31,9 +54,14 @@ def find_kicad_config_dir(cfg: AppConfig | None) -> Path | None:
             if anc in seen:
                 continue
             seen.add(anc)
+            if now - _MISSING.get(anc, float("-inf")) < _NEGATIVE_TTL_SEC:
+                continue
             kicad_dir = anc / ".config" / "kicad"
-            if kicad_dir.exists() and kicad_dir.is_dir():
+            if kicad_dir.is_dir():
+                _MISSING.pop(anc, None)
+                _FOUND[key] = kicad_dir
                 return kicad_dir
+            _MISSING[anc] = now
     return None
 
 
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import copy
+import heapq
+import mmap
+import os
+import re
+import time
+from logging import Logger
+from pathlib import Path
+
+from ..config import AppConfig
+from .importer import DEFAULT_SUBFOLDER
+from .kicad_paths import map_kicad_visible_path
+from .scan import MODEL_EXTS
+
+SNAPSHOT_CACHE_TTL_SEC = float(os.getenv("KICOMPORT_SNAPSHOT_CACHE_TTL_SEC", "30"))
+# (symbol_path, footprint_path, model_path, root_hint) -> (cached_at, stamp, libraries)
+SNAPSHOT_CACHE: dict[tuple[str, str, str, str], tuple[float, tuple[int, ...], list[dict]]] = {}
+
+
+def _snapshot_stamp(symbol_path: Path, footprint_path: Path, model_path: Path) -> tuple[int, ...]:
+    """Cheap change detector for the library snapshot (symbol file mtime/size + dir mtimes)."""
+    stamp: list[int] = []
+    try:
+        st = symbol_path.stat()
+        stamp.extend([st.st_mtime_ns, st.st_size])
+    except OSError:
+        stamp.extend([0, 0])
+    for path in (footprint_path, model_path):
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(0)
+    return tuple(stamp)
+
+
+# A string missing its closing quote (a truncated file) runs to the end of the data, so parentheses
+# inside it are never counted.
+_SYM_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"?|\(|\)', re.DOTALL)
+_SYM_HEAD_RE = re.compile(rb'\(\s*symbol\s+(?:"((?:[^"\\]|\\.)*)"?|([^\s()"]+))', re.DOTALL)
+_SYM_UNESCAPE_RE = re.compile(rb"\\(.)", re.DOTALL)
+
+
+def _decode_symbol_name(quoted: bytes | None, bare: bytes | None) -> str:
+    raw = _SYM_UNESCAPE_RE.sub(rb"\1", quoted) if quoted is not None else (bare or b"")
+    return raw.decode("utf-8", errors="ignore").strip()
+
+
+def _top_level_symbol_names(data: bytes | mmap.mmap) -> list[str]:
+    """
+    Collect names of top-level `(symbol ...)` entries using a C-level tokenizer.
+
+    Damaged files are still read: a stray `)` never takes the depth below zero, and a
+    truncated file simply yields the symbols that start before it ends.
+    """
+    names: list[str] = []
+    depth = 0
+    for m in _SYM_TOKEN_RE.finditer(data):
+        tok = m.group()
+        if tok == b"(":
+            # Only count top-level (kicad_symbol_lib ... (symbol "...") ...) entries.
+            if depth == 1:
+                head = _SYM_HEAD_RE.match(data, m.start())
+                if head:
+                    name = _decode_symbol_name(head.group(1), head.group(2))
+                    if name:
+                        names.append(name)
+            depth += 1
+        elif tok == b")":
+            depth = max(0, depth - 1)
+    return names
+
+
+def count_kicad_symbols(sym_path: Path, sample_limit: int = 8) -> tuple[int, list[str]]:
+    if not sym_path.exists():
+        return 0, []
+    try:
+        f = sym_path.open("rb")
+    except Exception:
+        return 0, []
+
+    with f:
+        data: bytes | mmap.mmap
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files (and some filesystems) can't be mapped.
+            try:
+                data = f.read()
+            except Exception:
+                return 0, []
+        try:
+            names = _top_level_symbol_names(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    unique = set(names)
+    # Only the first few names are shown; a bounded heap avoids sorting the whole library.
+    sample = heapq.nsmallest(sample_limit, unique, key=str.casefold)
+    return len(unique), sample
+
+
+def count_files(root: Path, *, suffixes: set[str] | None = None, pattern: str | None = None, sample_limit: int = 8) -> tuple[int, list[str]]:
+    if not root.exists():
+        return 0, []
+    if not root.is_dir():
+        return 0, []
+
+    count = 0
+    sample: list[str] = []
+    try:
+        if pattern is not None:
+            iterator = root.rglob(pattern)
+        else:
+            iterator = root.rglob("*")
+
+        for path in iterator:
+            if not path.is_file():
+                continue
+            if suffixes is not None and path.suffix.lower() not in suffixes:
+                continue
+            count += 1
+            if len(sample) < sample_limit:
+                try:
+                    sample.append(str(path.relative_to(root)))
+                except Exception:
+                    sample.append(path.name)
+    except Exception:
+        return 0, []
+
+    sample.sort(key=lambda s: s.casefold())
+    return count, sample
+
+
+def library_snapshot(cfg: AppConfig | None, root_hint: str | None, logger: Logger | None = None) -> list[dict]:
+    """Summarize the shared ~KiComport symbol/footprint/3D libraries for the dashboard (cached)."""
+    libraries: list[dict] = []
+    if not cfg:
+        return libraries
+    lib_name = DEFAULT_SUBFOLDER
+    symbol_path = Path(cfg.kicad_symbol_dir) / f"{lib_name}.kicad_sym"
+    footprint_path = Path(cfg.kicad_footprint_dir) / f"{lib_name}.pretty"
+    model_path = Path(cfg.kicad_3d_dir) / lib_name
+
+    cache_key = (str(symbol_path), str(footprint_path), str(model_path), root_hint or "")
+    stamp = _snapshot_stamp(symbol_path, footprint_path, model_path)
+    now = time.monotonic()
+    cached = SNAPSHOT_CACHE.get(cache_key)
+    if cached and (now - cached[0]) < SNAPSHOT_CACHE_TTL_SEC and cached[1] == stamp:
+        return copy.deepcopy(cached[2])
+
+    # Mount-point probes are loop-invariant; stat them once per snapshot.
+    config_root_exists = Path("/config").exists()
+    kicad_mount_exists = Path("/kicad").exists()
+
+    for label, p in [
+        ("Symbols", symbol_path),
+        ("Footprints", footprint_path),
+        ("3D Models", model_path),
+    ]:
+        raw_path = str(p)
+        kicad_path = map_kicad_visible_path(raw_path, root_hint)
+        entry = {
+            "label": label,
+            "path": raw_path,
+            "kicad_path": kicad_path,
+            "kicad_path_exists": False,
+            "path_issue": False,
+            "issue_reason": None,
+            "exists": False,
+            "count": 0,
+            "sample": [],
+            "truncated": False,
+        }
+        kicad_root_exists = True
+        if kicad_path.startswith("/config/") or kicad_path == "/config":
+            kicad_root_exists = config_root_exists
+        elif kicad_path.startswith("/kicad/") or kicad_path == "/kicad":
+            kicad_root_exists = kicad_mount_exists
+        if kicad_root_exists:
+            entry["kicad_path_exists"] = Path(kicad_path).exists()
+        try:
+            exists = p.exists()
+            entry["exists"] = exists
+            if root_hint == "/config" and raw_path.startswith("/kicad/"):
+                entry["path_issue"] = True
+                entry["issue_reason"] = "kicad_root_mismatch"
+            if not exists:
+                libraries.append(entry)
+                continue
+
+            if label == "Symbols":
+                count, sample = count_kicad_symbols(p)
+            elif label == "Footprints":
+                count, sample = count_files(p, pattern="*.kicad_mod")
+            else:
+                count, sample = count_files(p, suffixes=MODEL_EXTS)
+
+            entry["count"] = count
+            entry["sample"] = sample
+            if (
+                kicad_path
+                and kicad_path != raw_path
+                and kicad_root_exists
+                and not entry["kicad_path_exists"]
+            ):
+                entry["path_issue"] = True
+                entry["issue_reason"] = "kicad_path_missing"
+        except Exception:
+            if logger:
+                logger.exception("home.library_snapshot_failed", extra={"label": label, "path": raw_path})
+        libraries.append(entry)
+    SNAPSHOT_CACHE[cache_key] = (now, stamp, copy.deepcopy(libraries))
+    return libraries
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import queue
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
@@ -17,10 +26,38 @@ class JsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(payload).decode("utf-8")
         return json.dumps(payload)
 
 
+class _LocalQueueHandler(QueueHandler):
+    """Enqueue records for an in-process listener: merge args now, keep exc_info for `JsonFormatter`."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_LISTENER: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()  # drains queued records before returning
+        _LISTENER = None
+
+
 def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> Logger:
+    """
+    Configure the app logger.
+
+    Console/file output runs on a `QueueListener` thread; request handlers only enqueue records,
+    so a slow disk or terminal never adds latency to the request path.
+    """
     level = getattr(logging, log_level.upper(), logging.INFO)
     logger = logging.getLogger("kicad-intake")
     logger.setLevel(level)
@@ -29,17 +66,31 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> L
     console = logging.StreamHandler()
     console.setLevel(level)
     console.setFormatter(JsonFormatter())
-    logger.addHandler(console)
+    handlers: list[logging.Handler] = [console]
 
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
         file_handler.setLevel(level)
         file_handler.setFormatter(JsonFormatter())
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Re-running setup (e.g. a second app in the same process) replaces the previous listener.
+    global _LISTENER
+    _stop_listener()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _LISTENER = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _LISTENER.start()
+    logger.addHandler(_LocalQueueHandler(log_queue))
 
     # Align uvicorn logging with app level
     logging.getLogger("uvicorn").setLevel(level)
     logging.getLogger("uvicorn.error").setLevel(level)
     logging.getLogger("uvicorn.access").setLevel(level)
     return logger
+
+
+atexit.register(_stop_listener)
@@ -1,47 +1,82 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Tuple
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 import httpx
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 from ..db.models import CandidateFile, Component
 
 
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """App-wide client for Ollama calls; keeps connections alive between scoring requests."""
+    return httpx.AsyncClient(limits=httpx.Limits(max_connections=16, max_keepalive_connections=8))
+
+
 class OllamaClient:
-    def __init__(self, base_url: str, model: str, timeout: int = 30, max_retries: int = 2):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        timeout: int = 30,
+        max_retries: int = 2,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.timeout = timeout
         self.max_retries = max_retries
+        self.http_client = http_client
+
+    @asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        # The shared client is owned (and closed) by the app; without one, fall back to a per-call client.
+        if self.http_client is not None and not self.http_client.is_closed:
+            yield self.http_client
+            return
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            yield client
 
     async def score_candidates(self, job_id: int, components: List[Component]) -> Dict[int, Tuple[float, str]]:
         payload = _build_payload(job_id, components, self.model)
         url = f"{self.base_url}/api/chat"
-        for attempt in range(self.max_retries + 1):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.post(url, json=payload)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return _parse_scores(data)
-            except Exception:
-                if attempt >= self.max_retries:
-                    raise
+        # One client for every attempt, so retries reuse the open connection.
+        async with self._http() as client:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return _parse_scores(await _stream_chat(client, url, payload, self.timeout))
+                except Exception:
+                    if attempt >= self.max_retries:
+                        raise
         return {}
 
     async def health(self) -> dict:
         url = f"{self.base_url}/api/tags"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.get(url)
+        async with self._http() as client:
+            resp = await client.get(url, timeout=self.timeout)
             resp.raise_for_status()
             return resp.json()
 
     async def list_models(self) -> list[str]:
         """Return available model names from Ollama."""
         url = f"{self.base_url}/api/tags"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.get(url)
+        async with self._http() as client:
+            resp = await client.get(url, timeout=self.timeout)
             resp.raise_for_status()
             data = resp.json()
             raw_models = data.get("models") or data.get("data") or data.get("tags") or []
@@ -64,6 +99,30 @@ class OllamaClient:
             return unique
 
 
+async def _stream_chat(client: httpx.AsyncClient, url: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    """
+    POST a streaming chat request and reassemble the reply as a non-streamed response.
+
+    Ollama sends one JSON object per line as tokens are generated, so the read timeout applies between
+    chunks rather than to the whole generation, and the raw body is never buffered as one document.
+    """
+    parts: list[str] = []
+    body = _dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    async with client.stream("POST", url, content=body, headers=headers, timeout=timeout) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line.strip():
+                continue
+            chunk = _loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            parts.append((chunk.get("message") or {}).get("content") or "")
+            if chunk.get("done"):
+                break
+    return {"message": {"content": "".join(parts) or "{}"}}
+
+
 def _build_payload(job_id: int, components: List[Component], model: str) -> Dict[str, Any]:
     items = []
     for comp in components:
@@ -89,13 +148,13 @@ def _build_payload(job_id: int, components: List[Component], model: str) -> Dict
         "Return JSON with scores and reasons: {\"scores\": [{\"id\": <cand_id>, \"ai_score\": <0-1>, \"ai_reason\": \"...\"}]}. "
         "Use heuristics: name relevance, description clarity, pad/pin counts. Keep answers concise."
     )
-    return {"model": model, "messages": [{"role": "user", "content": prompt + "\n" + json.dumps(items)}], "stream": False}
+    return {"model": model, "messages": [{"role": "user", "content": prompt + "\n" + _dumps(items).decode("utf-8")}], "stream": True}
 
 
 def _parse_scores(response: Dict[str, Any]) -> Dict[int, Tuple[float, str]]:
     try:
         content = response.get("message", {}).get("content", "{}")
-        data = json.loads(content)
+        data = _loads(content)
         raw_scores = data.get("scores", {})
         out: Dict[int, Tuple[float, str]] = {}
         if isinstance(raw_scores, list):
@@ -1,37 +1,122 @@
 from __future__ import annotations
 
-import base64
+import hashlib
+import io
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from typing import Tuple
+from typing import Iterable, Tuple
+from urllib.parse import quote
 
 from ..db.models import CandidateFile, CandidateType
+from .fileio import atomic_write, mapped
+from .preview_parse import parse_pads, parse_symbol
+
+try:
+    import pybase64 as _b64  # type: ignore
+except Exception:  # pragma: no cover
+    import base64 as _b64
+
+# Resolved once; pybase64 can hand back the str directly, the stdlib only bytes.
+_B64_AS_STRING = getattr(_b64, "b64encode_as_string", None)
+_B64_ENCODE = _b64.b64encode
+
+# Caps concurrent kicad-cli processes; preview requests run in FastAPI's threadpool, so a burst
+# of them (e.g. a job page opening) would otherwise fork one kicad-cli each.
+PREVIEW_WORKERS = int(os.getenv("KICOMPORT_PREVIEW_WORKERS", str(min(4, os.cpu_count() or 1))))
+_KICAD_CLI_SLOTS = threading.BoundedSemaphore(max(1, PREVIEW_WORKERS))
+
+# Rendered previews keyed by (type, name, path, mtime_ns, size); a changed file gets a new key.
+_PREVIEW_CACHE_SIZE = int(os.getenv("KICOMPORT_PREVIEW_CACHE_SIZE", "256"))
+_PREVIEW_CACHE: OrderedDict[tuple, Tuple[str, str]] = OrderedDict()
+_PREVIEW_LOCK = threading.Lock()
+_NATIVE_SYMBOL_MAX_BYTES = 8 * 1024
+
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# %-templates for the per-pad/per-pin SVG fragments: one string per element instead of several appends.
+_PAD_SVG = (
+    '<g transform="translate(%s,%s) rotate(%s)">\n'
+    '<rect x="%s" y="%s" width="%s" height="%s" fill="#36c574" fill-opacity="0.5" stroke="#2ea043" />\n'
+)
+_PAD_LABEL_SVG = '<text x="0" y="4" fill="#e9edf5" font-size="12" text-anchor="middle">%s</text>\n'
+_PIN_SVG = '<line x1="%s" y1="%s" x2="%s" y2="%s" stroke="#36c574" stroke-width="2" />\n<circle cx="%s" cy="%s" r="3" fill="#2ea043" />'
+_PIN_NAME_SVG = '\n<text x="%s" y="%s" fill="#e9edf5" font-size="12" text-anchor="%s" dy="4">%s</text>'
+_PIN_NUMBER_SVG = '\n<text x="%s" y="%s" fill="#e9edf5" font-size="12" font-weight="700" text-anchor="middle" dy="4">%s</text>'
+# Whole-pin templates by (has name, has number), so each pin is a single % format.
+_PIN_TEMPLATES = {
+    (False, False): _PIN_SVG,
+    (True, False): _PIN_SVG + _PIN_NAME_SVG,
+    (False, True): _PIN_SVG + _PIN_NUMBER_SVG,
+    (True, True): _PIN_SVG + _PIN_NAME_SVG + _PIN_NUMBER_SVG,
+}
+_POLYLINE_SVG = '<polyline points="%s" fill="none" stroke="#9aa6b7" stroke-width="2" />'
+
+
+def _data_url(data: bytes, mime: str) -> str:
+    # Concatenate once and decode once.
+    if _B64_AS_STRING is not None:
+        return f"data:{mime};base64," + _B64_AS_STRING(data)
+    return (b"data:%s;base64," % mime.encode("ascii") + _B64_ENCODE(data)).decode("ascii")
+
+
+# SVG is text, so it goes into the data URL percent-encoded rather than base64 (smaller, no encode
+# pass). `&`, `"`, `#`, `%`, `<` and `>` must stay escaped: the URL ends up inside an HTML attribute.
+_SVG_URL_SAFE = " :/=-._~,;()!*+@?$'[]"
 
 
 def _encode_svg(svg: str) -> str:
-    data = svg.encode("utf-8")
-    b64 = base64.b64encode(data).decode("ascii")
-    return f"data:image/svg+xml;base64,{b64}"
+    return "data:image/svg+xml;charset=utf-8," + quote(svg, safe=_SVG_URL_SAFE)
+
+
+_TEXT_LINE_HEIGHT = 18
+_TEXT_PADDING = 12
+_TEXT_LINE_SVG = '<text x="%d" y="%d" fill="#e9edf5" font-size="14">%s</text>'
+
 
+@lru_cache(maxsize=16)
+def _svg_frame(width: int, height: int) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" style="background:#0f141b;color:#e9edf5;font-family:monospace;">\n'
+        f'<rect x="0" y="0" width="{width}" height="{height}" fill="#0f141b" stroke="#243043" stroke-width="1"/>'
+    )
 
-def _build_svg(text_lines: list[str], width: int = 480, height: int = 360) -> str:
-    line_height = 18
-    padding = 12
-    svg_lines = [
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" style="background:#0f141b;color:#e9edf5;font-family:monospace;">',
-        f'<rect x="0" y="0" width="{width}" height="{height}" fill="#0f141b" stroke="#243043" stroke-width="1"/>',
+
+def _build_svg(text_lines: Iterable[str], width: int = 480, height: int = 360) -> str:
+    line_height = _TEXT_LINE_HEIGHT
+    padding = _TEXT_PADDING
+    max_lines = max(0, (height - padding * 2) // line_height)
+    template = _TEXT_LINE_SVG
+    escape = _HTML_ESCAPE
+    body = [
+        template % (padding, y, line.translate(escape))
+        for y, line in zip(count(padding + line_height, line_height), islice(text_lines, max_lines))
     ]
-    y = padding + line_height
-    for line in text_lines[: int((height - padding * 2) / line_height)]:
-        safe_line = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        svg_lines.append(f'<text x="{padding}" y="{y}" fill="#e9edf5" font-size="14">{safe_line}</text>')
-        y += line_height
-    svg_lines.append("</svg>")
-    return "\n".join(svg_lines)
+    return "\n".join([_svg_frame(width, height), *body, "</svg>"])
+
+
+def _kicad_cli_ready(kicad_cli: str = "kicad-cli") -> bool:
+    """True when kicad-cli is on PATH and a render slot is free right now."""
+    if shutil.which(kicad_cli) is None:
+        return False
+    if not _KICAD_CLI_SLOTS.acquire(blocking=False):
+        return False
+    _KICAD_CLI_SLOTS.release()
+    return True
 
 
 def _run_kicad_cli(cmd: list[str]) -> None:
     try:
-        subprocess.check_output(cmd, stderr=subprocess.STDOUT, timeout=15)
+        with _KICAD_CLI_SLOTS:
+            subprocess.check_output(cmd, stderr=subprocess.STDOUT, timeout=15)
     except subprocess.CalledProcessError as exc:
         raise RuntimeError(f"kicad-cli failed: {exc.output.decode(errors='ignore')}") from exc
     except FileNotFoundError as exc:
@@ -53,10 +138,44 @@ def _render_symbol_or_footprint(cand: CandidateFile, kicad_cli: str = "kicad-cli
         _run_kicad_cli(cmd)
         if not out_svg.exists():
             raise RuntimeError("kicad-cli did not produce an output file")
-        data = out_svg.read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
+        svg = out_svg.read_text(encoding="utf-8", errors="replace")
         note = "Rendered via kicad-cli."
-        return f"data:image/svg+xml;base64,{b64}", note
+        return _encode_svg(svg), note
+
+
+# pyrender's OffscreenRenderer owns a GL context (and its framebuffers) that is expensive to create
+# and bound to the thread that made it current, so one renderer lives on one dedicated thread.
+_RENDER_3D_THREAD = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kicomport-3d")
+_RENDERER = None
+
+
+def _offscreen_render(scene):
+    """Render `scene` on the 3D thread, creating the shared renderer on first use."""
+    global _RENDERER
+    if _RENDERER is None:
+        import pyrender  # type: ignore
+
+        _RENDERER = pyrender.OffscreenRenderer(viewport_width=800, viewport_height=600)
+    try:
+        color, _ = _RENDERER.render(scene)
+    except Exception:
+        # Don't keep reusing a context that may be broken.
+        renderer, _RENDERER = _RENDERER, None
+        try:
+            renderer.delete()
+        except Exception:
+            pass
+        raise
+    return color
+
+
+@lru_cache(maxsize=1)
+def _scene_fixtures():
+    import pyrender  # type: ignore
+
+    camera = pyrender.PerspectiveCamera(yfov=1.0)
+    light = pyrender.DirectionalLight(color=[1.0, 1.0, 1.0], intensity=2.0)
+    return camera, light
 
 
 def _render_3d(cand: CandidateFile) -> Tuple[str, str]:
@@ -73,53 +192,110 @@ def _render_3d(cand: CandidateFile) -> Tuple[str, str]:
         mesh = trimesh.load(src, force="mesh")
         scene = pyrender.Scene()
         scene.add(pyrender.Mesh.from_trimesh(mesh))
-        camera = pyrender.PerspectiveCamera(yfov=1.0)
-        light = pyrender.DirectionalLight(color=[1.0, 1.0, 1.0], intensity=2.0)
+        camera, light = _scene_fixtures()
         scene.add(light)
         scene.add(camera, pose=[[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 2], [0, 0, 0, 1]])
-        r = pyrender.OffscreenRenderer(viewport_width=800, viewport_height=600)
-        color, _ = r.render(scene)
-        r.delete()
+        color = _RENDER_3D_THREAD.submit(_offscreen_render, scene).result()
+        import PIL.features  # type: ignore
         import PIL.Image  # type: ignore
 
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            PIL.Image.fromarray(color).save(tmp.name)
-            data = Path(tmp.name).read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
+        buf = io.BytesIO()
+        image = PIL.Image.fromarray(color)
+        # One-off UI preview: fastest lossy WebP when Pillow has it, else PNG at a fast zlib level.
+        if PIL.features.check("webp"):
+            image.save(buf, format="WEBP", quality=70, method=0)
+            mime = "image/webp"
+        else:
+            image.save(buf, format="PNG", compress_level=1)
+            mime = "image/png"
         note = "Rendered via trimesh/pyrender."
-        return f"data:image/png;base64,{b64}", note
+        return _data_url(buf.getvalue(), mime), note
     except Exception as exc:
         raise RuntimeError(f"3D render failed: {exc}") from exc
 
 
-def render_candidate_preview(cand: CandidateFile) -> Tuple[str, str]:
+def render_candidate_preview(cand: CandidateFile, thumbnail_dir: Path | None = None) -> Tuple[str, str]:
     """
     Return a data URL plus a note. Prefers real renders when tools are available,
-    otherwise falls back to a text-based SVG.
+    otherwise falls back to the built-in approximate renderers and then a text-based SVG.
+
+    Successful renders are cached per file content (mtime + size), so kicad-cli and 3D
+    renders only run again after the file changes; fallbacks are returned uncached so a
+    failed render is retried on the next request. With `thumbnail_dir`, 3D renders are
+    also kept on disk there and survive restarts.
     """
     path = Path(cand.path)
-    if not path.exists():
-        raise FileNotFoundError(str(path))
+    try:
+        st = path.stat()
+    except OSError:
+        raise FileNotFoundError(str(path)) from None
+    key = (cand.type, cand.name, str(path), st.st_mtime_ns, st.st_size)
+    with _PREVIEW_LOCK:
+        hit = _PREVIEW_CACHE.get(key)
+        if hit is not None:
+            _PREVIEW_CACHE.move_to_end(key)
+            return hit
+    thumbnail = None
+    if thumbnail_dir is not None and cand.type == CandidateType.model:
+        digest = hashlib.md5(f"{path}:{st.st_mtime_ns}:{st.st_size}".encode("utf-8")).hexdigest()
+        thumbnail = Path(thumbnail_dir) / f"{digest}.txt"
+    result = None
+    if thumbnail is not None:
+        # Stored as "<note>\n<data URL>" so a disk hit returns exactly what the render did.
+        try:
+            note, _, image = thumbnail.read_text(encoding="utf-8").rpartition("\n")
+            result = (image, note)
+        except (OSError, UnicodeDecodeError):
+            result = None
+    if result is None:
+        image, note, cacheable = _render_candidate_preview(cand, path, st.st_size)
+        result = (image, note)
+        if not cacheable:
+            return result
+        if thumbnail is not None:
+            try:
+                atomic_write(thumbnail, f"{note}\n{image}", durable=False)
+            except OSError:
+                pass
+    if _PREVIEW_CACHE_SIZE > 0:
+        with _PREVIEW_LOCK:
+            _PREVIEW_CACHE[key] = result
+            _PREVIEW_CACHE.move_to_end(key)
+            while len(_PREVIEW_CACHE) > _PREVIEW_CACHE_SIZE:
+                _PREVIEW_CACHE.popitem(last=False)
+    return result
+
+
+def _render_candidate_preview(cand: CandidateFile, path: Path, size: int) -> Tuple[str, str, bool]:
+    """Render a preview; the flag is False for fallbacks (failed/unavailable renderer) that must not be cached."""
     if cand.type in {CandidateType.symbol, CandidateType.footprint}:
+        if cand.type == CandidateType.symbol and size < _NATIVE_SYMBOL_MAX_BYTES and not _kicad_cli_ready():
+            # kicad-cli gives the real render; only when it is missing or every slot is taken do small
+            # symbols go straight to the (approximate) native renderer instead of failing/queueing.
+            # A busy-slot render is a stand-in, so leave it uncached and let kicad-cli render it next time.
+            try:
+                return _render_symbol_svg(path), "", shutil.which("kicad-cli") is None
+            except Exception:
+                pass
         try:
             img, _ = _render_symbol_or_footprint(cand)
-            return img, ""
+            return img, "", True
         except Exception as exc:
             fallback_note = f"Rendering via kicad-cli failed: {exc}. Trying lightweight parser."
             try:
                 if cand.type == CandidateType.footprint:
-                    return _render_footprint_svg(path), ""
+                    return _render_footprint_svg(path), "", False
                 else:
-                    return _render_symbol_svg(path), ""
+                    return _render_symbol_svg(path), "", False
             except Exception as exc2:
                 fallback_note = f"Render parsers failed: {exc2}. Showing text preview."
     elif cand.type == CandidateType.model:
         try:
             img, _ = _render_3d(cand)
-            return img, ""
+            return img, "", True
         except Exception as exc:
             # Server-side 3D libs missing; let the browser viewer handle it without showing an error note.
-            return "", ""
+            return "", "", False
     else:
         fallback_note = "Showing text preview."
 
@@ -138,40 +314,55 @@ def render_candidate_preview(cand: CandidateFile) -> Tuple[str, str]:
     except Exception:
         lines.append("Content unavailable.")
     svg = _build_svg(lines)
-    return _encode_svg(svg), fallback_note
-import shutil
-import subprocess
-import tempfile
+    return _encode_svg(svg), fallback_note, False
+
+
+# Exact unit vectors for the axis-aligned rotations nearly every pin/pad uses (cos(90°) is not 0.0).
+# 270° stays on math.cos: the sign of its rounding noise (< 0) is what anchors those pin names at "end".
+_AXIS_DIRECTIONS = {0.0: (1.0, 0.0), 90.0: (0.0, 1.0), 180.0: (-1.0, 0.0), -90.0: (0.0, -1.0)}
+
+
+@lru_cache(maxsize=64)
+def _direction(rot: float) -> Tuple[float, float]:
+    """(cos, sin) of a rotation in degrees, memoized per angle."""
+    hit = _AXIS_DIRECTIONS.get(rot)
+    if hit is not None:
+        return hit
+    ang = math.radians(rot)
+    return math.cos(ang), math.sin(ang)
+
+
 def _render_footprint_svg(path: Path) -> str:
-    import math
-    text = path.read_text(errors="ignore").splitlines()
-    pads = []
-    for line in text:
-        line = line.strip()
-        if line.startswith("(pad "):
-            # crude parse: pad "num" type shape (at x y rot?) (size sx sy)
-            try:
-                parts = line.replace("(", " ").replace(")", " ").split()
-                pad_id = parts[1].strip('"') if len(parts) > 1 else ""
-                idx_at = parts.index("at") + 1
-                x = float(parts[idx_at])
-                y = float(parts[idx_at + 1])
-                rot = float(parts[idx_at + 2]) if parts[idx_at + 2].replace(".", "", 1).lstrip("-").isdigit() else 0.0
-                idx_size = parts.index("size") + 1
-                sx = float(parts[idx_size])
-                sy = float(parts[idx_size + 1])
-                pads.append((x, y, sx, sy, rot, pad_id))
-            except Exception:
-                continue
+    # Parse straight off an mmap: no Python copy of the file, no decode, no line list.
+    with mapped(path) as data:
+        pads = parse_pads(data)
     if not pads:
         raise RuntimeError("No pads parsed")
-    xs = []
-    ys = []
-    for x, y, sx, sy, *_ in pads:
-        xs.extend([x - sx / 2, x + sx / 2])
-        ys.extend([y - sy / 2, y + sy / 2])
-    minx, maxx = min(xs) - 1, max(xs) + 1
-    miny, maxy = min(ys) - 1, max(ys) + 1
+    # One pass for the bounding box of the (rotated) pads; abs() also covers malformed negative sizes.
+    minx = miny = math.inf
+    maxx = maxy = -math.inf
+    direction = _direction
+    for x, y, sx, sy, rot, _ in pads:
+        if rot:
+            cos_r, sin_r = direction(rot)
+            cos_r, sin_r = abs(cos_r), abs(sin_r)
+            sx, sy = abs(sx), abs(sy)
+            hx = (cos_r * sx + sin_r * sy) / 2
+            hy = (sin_r * sx + cos_r * sy) / 2
+        else:
+            # Most pads are unrotated: the half extents are just half the size.
+            hx = abs(sx) / 2
+            hy = abs(sy) / 2
+        lo = x - hx
+        if lo < minx: minx = lo
+        hi = x + hx
+        if hi > maxx: maxx = hi
+        lo = y - hy
+        if lo < miny: miny = lo
+        hi = y + hy
+        if hi > maxy: maxy = hi
+    minx, maxx = minx - 1, maxx + 1
+    miny, maxy = miny - 1, maxy + 1
     width = maxx - minx
     height = maxy - miny
     # scale to viewBox ~ 400x400
@@ -180,87 +371,25 @@ def _render_footprint_svg(path: Path) -> str:
     def ty(y): return (maxy - y) * scale  # flip y
     svg = [f'<svg xmlns="http://www.w3.org/2000/svg" width="420" height="420" viewBox="0 0 420 420" style="background:#0f141b;">']
     svg.append('<rect x="0" y="0" width="420" height="420" fill="#0f141b" stroke="#243043" />')
+    # Hot loop: bind the append method and module globals to locals once.
+    append = svg.append
+    escape, pad_svg, label_svg = _HTML_ESCAPE, _PAD_SVG, _PAD_LABEL_SVG
     for x, y, sx, sy, rot, pad_id in pads:
-        cx = tx(x)
-        cy = ty(y)
+        pad_id = pad_id.translate(escape)
         rw = sx * scale
         rh = sy * scale
-        svg.append(f'<g transform="translate({cx},{cy}) rotate({-rot})">')
-        svg.append(f'<rect x="{-rw/2}" y="{-rh/2}" width="{rw}" height="{rh}" fill="#36c574" fill-opacity="0.5" stroke="#2ea043" />')
-        if pad_id:
-            svg.append(f'<text x="0" y="4" fill="#e9edf5" font-size="12" text-anchor="middle">{pad_id}</text>')
-        svg.append('</g>')
+        pad = pad_svg % (tx(x), ty(y), -rot, -rw / 2, -rh / 2, rw, rh)
+        append(pad + label_svg % pad_id + "</g>" if pad_id else pad + "</g>")
     svg.append('</svg>')
-    data = "\n".join(svg).encode("utf-8")
-    b64 = base64.b64encode(data).decode("ascii")
-    return f"data:image/svg+xml;base64,{b64}"
+    return _encode_svg("\n".join(svg))
 
 
 def _render_symbol_svg(path: Path) -> str:
-    lines = path.read_text(errors="ignore").splitlines()
-    pins = []
-    polys = []
-    poly_collect = False
-    current_poly = []
-    top_text = []
-    for ln in lines:
-        stripped = ln.strip()
-        if stripped.startswith("(property \"Value\"") or stripped.startswith("(property \"Reference\""):
-            try:
-                parts = stripped.split("\"")
-                if len(parts) >= 4:
-                    label = parts[1]
-                    value = parts[3]
-                    top_text.append((label, value))
-            except Exception:
-                pass
-        if stripped.startswith("(polyline"):
-            poly_collect = True
-            current_poly = []
-            continue
-        if poly_collect:
-            if stripped.startswith(")"):
-                if current_poly:
-                    polys.append(current_poly)
-                poly_collect = False
-                continue
-            if stripped.startswith("(xy"):
-                try:
-                    parts = stripped.replace("(", " ").replace(")", " ").split()
-                    x = float(parts[1]); y = float(parts[2])
-                    current_poly.append((x, y))
-                except Exception:
-                    continue
-        if stripped.startswith("(pin "):
-            try:
-                parts = stripped.replace("(", " ").replace(")", " ").split()
-                pin_type = parts[1] if len(parts) > 1 else ""
-                idx_at = parts.index("at") + 1
-                x = float(parts[idx_at])
-                y = float(parts[idx_at + 1])
-                rot = float(parts[idx_at + 2]) if parts[idx_at + 2].replace(".", "", 1).lstrip("-").isdigit() else 0.0
-                length = 5.0
-                if "length" in parts:
-                    try:
-                        length = float(parts[parts.index("length") + 1])
-                    except Exception:
-                        pass
-                pins.append({"x": x, "y": y, "length": length, "rot": rot, "name": "", "number": "", "ptype": pin_type})
-            except Exception:
-                continue
-        if pins:
-            if stripped.startswith("(name "):
-                try:
-                    val = stripped.split("\"")[1]
-                    pins[-1]["name"] = val
-                except Exception:
-                    pass
-            if stripped.startswith("(number "):
-                try:
-                    val = stripped.split("\"")[1]
-                    pins[-1]["number"] = val
-                except Exception:
-                    pass
+    with mapped(path) as data:
+        shapes = parse_symbol(data)
+    pins = shapes.pins
+    polys = shapes.polylines
+    top_text = [(label, value.translate(_HTML_ESCAPE)) for label, value in shapes.labels]
     if not pins:
         raise RuntimeError("No pins parsed")
 
@@ -269,7 +398,6 @@ def _render_symbol_svg(path: Path) -> str:
     INTERNAL_SIZE = 2000
     TEXT_OFFSET_MM = 2.0
 
-    import math
     # Body bounds
     body_minx = body_maxx = None
     body_miny = body_maxy = None
@@ -285,10 +413,9 @@ def _render_symbol_svg(path: Path) -> str:
     ys = []
     if body_minx is not None:
         xs.extend([body_minx, body_maxx]); ys.extend([body_miny, body_maxy])
-    for p in pins:
-        x = p["x"]; y = p["y"]; length = p["length"]; rot = p["rot"]
-        ang = math.radians(rot)
-        dirx = math.cos(ang); diry = math.sin(ang)
+    directions = [_direction(p.rot) for p in pins]
+    for p, (dirx, diry) in zip(pins, directions):
+        x = p.x; y = p.y; length = p.length
         xs.append(x); ys.append(y)
         xs.append(x + dirx * length); ys.append(y + diry * length)
         xs.append(x + dirx * (length + TEXT_OFFSET_MM)); ys.append(y + diry * (length + TEXT_OFFSET_MM))
@@ -310,9 +437,11 @@ def _render_symbol_svg(path: Path) -> str:
     svg = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{INTERNAL_SIZE}" height="{INTERNAL_SIZE}" viewBox="0 0 {INTERNAL_SIZE} {INTERNAL_SIZE}" style="background:#0f141b;">']
     svg.append(f'<rect x="0" y="0" width="{INTERNAL_SIZE}" height="{INTERNAL_SIZE}" fill="#0f141b" stroke="#243043" />')
 
+    # Hot loops: bind the append method and module globals to locals once.
+    append = svg.append
+    escape, pin_templates = _HTML_ESCAPE, _PIN_TEMPLATES
     for poly in polys:
-        pts = " ".join(f"{tx(x)},{ty(y)}" for x, y in poly)
-        svg.append(f'<polyline points="{pts}" fill="none" stroke="#9aa6b7" stroke-width="2" />')
+        append(_POLYLINE_SVG % " ".join(["%s,%s" % (tx(x), ty(y)) for x, y in poly]))
 
     # Titles
     if body_minx is not None:
@@ -325,30 +454,26 @@ def _render_symbol_svg(path: Path) -> str:
         svg.append(f'<text x="{tx(title_cx)}" y="{ty(title_y_base) - i*16}" fill="#9fc4ff" font-size="16" text-anchor="middle">{val}</text>')
 
     # Pins
-    for p in pins:
-        x_mm = p["x"]; y_mm = p["y"]; length_mm = p["length"]; rot_deg = p["rot"]
-        ang = math.radians(rot_deg)
-        dirx = math.cos(ang); diry = math.sin(ang)
+    for p, (dirx, diry) in zip(pins, directions):
+        x_mm = p.x; y_mm = p.y; length_mm = p.length
         x0 = tx(x_mm); y0 = ty(y_mm)
         x1 = x0 + dirx * length_mm * SCALE
         y1 = y0 - diry * length_mm * SCALE
-        svg.append(f'<line x1="{x0}" y1="{y0}" x2="{x1}" y2="{y1}" stroke="#36c574" stroke-width="2" />')
-        svg.append(f'<circle cx="{x0}" cy="{y0}" r="3" fill="#2ea043" />')
-        name_txt = str(p.get("name") or "").strip()
-        num_txt = str(p.get("number") or "").strip()
+        args = [x0, y0, x1, y1, x0, y0]
+        name_txt = p.name.strip().translate(escape)
+        num_txt = p.number.strip().translate(escape)
         text_dist = (length_mm + TEXT_OFFSET_MM) * SCALE
         name_x = x0 + dirx * text_dist
         name_y = y0 - diry * text_dist
         if name_txt:
             anchor = "start" if dirx >= 0 else "end"
-            svg.append(f'<text x="{name_x}" y="{name_y}" fill="#e9edf5" font-size="12" text-anchor="{anchor}" dy="4">{name_txt}</text>')
+            args += (name_x, name_y, anchor, name_txt)
         if num_txt:
             num_offset = 6
             num_x = x0 - diry * num_offset
             num_y = y0 - dirx * num_offset
-            svg.append(f'<text x="{num_x}" y="{num_y}" fill="#e9edf5" font-size="12" font-weight="700" text-anchor="middle" dy="4">{num_txt}</text>')
+            args += (num_x, num_y, num_txt)
+        append(pin_templates[bool(name_txt), bool(num_txt)] % tuple(args))
 
     svg.append('</svg>')
-    data = "\n".join(svg).encode("utf-8")
-    b64 = base64.b64encode(data).decode("ascii")
-    return f"data:image/svg+xml;base64,{b64}"
+    return _encode_svg("\n".join(svg))
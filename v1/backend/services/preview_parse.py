@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import mmap
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+# Pure, fully annotated parsers for the lightweight preview renderers. Kept free of I/O and
+# SVG concerns so the module can be compiled ahead of time (e.g. `mypyc preview_parse.py`).
+# They scan the raw file bytes (or an mmap of the file); only the few matched text fields are decoded.
+
+ReadableBuffer = Union[bytes, mmap.mmap]
+Pad = Tuple[float, float, float, float, float, str]  # x, y, size x, size y, rotation, pad number
+
+_NUM = r"[-+]?(?:\d+\.?\d*|\.\d+)"
+_QUOTED = r'"(?:[^"\\]|\\.)*"'
+_PAD_RE = re.compile(
+    (
+        rf"\(pad\s+(?P<id>{_QUOTED}|[^\s()]+)[^()]*"
+        rf"\(at\s+(?P<x>{_NUM})\s+(?P<y>{_NUM})(?:\s+(?P<rot>{_NUM}))?[^()]*\)"
+        rf"(?:\s*\([^()]*\))*?\s*\(size\s+(?P<sx>{_NUM})\s+(?P<sy>{_NUM})\s*\)"
+    ).encode()
+)
+_SYMBOL_TOKEN_RE = re.compile(
+    (
+        rf'\(property\s+"(?P<label>Reference|Value)"\s+"(?P<value>(?:[^"\\]|\\.)*)"'
+        rf"|\(polyline\s*\(pts(?P<pts>(?:\s*\(xy\s+{_NUM}\s+{_NUM}\s*\))*)\s*\)"
+        rf"|\(pin\s+(?P<ptype>[^\s()]+)[^()]*"
+        rf"\(at\s+(?P<x>{_NUM})\s+(?P<y>{_NUM})(?:\s+(?P<rot>{_NUM}))?[^()]*\)"
+        rf"(?:\s*\(length\s+(?P<length>{_NUM})\s*\))?"
+        rf'|\((?P<field>name|number)\s+"(?P<text>(?:[^"\\]|\\.)*)"'
+    ).encode()
+)
+_XY_RE = re.compile(rf"\(xy\s+({_NUM})\s+({_NUM})\s*\)".encode())
+
+
+def _text(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore")
+
+
+@dataclass
+class SymbolPin:
+    x: float
+    y: float
+    length: float
+    rot: float
+    ptype: str
+    name: str = ""
+    number: str = ""
+
+
+@dataclass
+class SymbolShapes:
+    pins: List[SymbolPin] = field(default_factory=list)
+    polylines: List[List[Tuple[float, float]]] = field(default_factory=list)
+    labels: List[Tuple[str, str]] = field(default_factory=list)  # (Reference|Value, text) in file order
+
+
+def parse_pads(data: ReadableBuffer) -> List[Pad]:
+    pads: List[Pad] = []
+    for m in _PAD_RE.finditer(data):
+        rot = float(m["rot"]) if m["rot"] else 0.0
+        pads.append((float(m["x"]), float(m["y"]), float(m["sx"]), float(m["sy"]), rot, _text(m["id"].strip(b'"'))))
+    return pads
+
+
+def parse_symbol(data: ReadableBuffer) -> SymbolShapes:
+    shapes = SymbolShapes()
+    pins = shapes.pins
+    for m in _SYMBOL_TOKEN_RE.finditer(data):
+        if m["label"]:
+            shapes.labels.append((_text(m["label"]), _text(m["value"])))
+        elif m["pts"] is not None:
+            poly = [(float(x), float(y)) for x, y in _XY_RE.findall(m["pts"])]
+            if poly:
+                shapes.polylines.append(poly)
+        elif m["ptype"]:
+            rot = float(m["rot"]) if m["rot"] else 0.0
+            length = float(m["length"]) if m["length"] else 5.0
+            pins.append(SymbolPin(float(m["x"]), float(m["y"]), length, rot, _text(m["ptype"])))
+        elif pins:
+            # `(name ...)` / `(number ...)` belong to the most recent pin.
+            if m["field"] == b"name":
+                pins[-1].name = _text(m["text"])
+            else:
+                pins[-1].number = _text(m["text"])
+    return shapes
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Optional
 
@@ -14,15 +16,24 @@ LOW_TRUST_SEGMENTS = {"temp", "tmp", "old", "backup", "legacy", "imported", "con
 def path_trust_bonus(path: Path | None) -> float:
     if not path:
         return 0.0
-    parts = {p.lower() for p in path.parts}
+    # Candidates share a handful of library folders, so the folder part is memoized; only the
+    # file name is checked per call.
+    high, low = _folder_trust(path.parent.parts)
+    name = path.name.lower()
     bonus = 0.0
-    if parts & HIGH_TRUST_SEGMENTS:
+    if high or name in HIGH_TRUST_SEGMENTS:
         bonus += 0.05
-    if parts & LOW_TRUST_SEGMENTS:
+    if low or name in LOW_TRUST_SEGMENTS:
         bonus -= 0.05
     return bonus
 
 
+@lru_cache(maxsize=4096)
+def _folder_trust(parts: tuple[str, ...]) -> tuple[bool, bool]:
+    lowered = {p.lower() for p in parts}
+    return not HIGH_TRUST_SEGMENTS.isdisjoint(lowered), not LOW_TRUST_SEGMENTS.isdisjoint(lowered)
+
+
 def looks_like_part_number(name: str) -> bool:
     return bool(re.match(r"^[a-zA-Z]{1,5}\d{2,}[a-zA-Z0-9-]*$", name))
 
@@ -51,14 +62,22 @@ def quality_score_for_candidate(cf: CandidateFile) -> float:
 
 
 def consistency_adjustment(component: Component) -> None:
-    symbols = [c for c in component.candidates if c.type == CandidateType.symbol]
-    footprints = [c for c in component.candidates if c.type == CandidateType.footprint]
-    if not symbols or not footprints:
+    symbol_pins: set[int] = set()
+    footprints = []
+    for c in component.candidates:
+        if c.type == CandidateType.symbol:
+            if c.pin_count:
+                symbol_pins.add(c.pin_count)
+        elif c.type == CandidateType.footprint:
+            footprints.append(c)
+    if not symbol_pins or not footprints:
         return
-    symbol_pins = [s.pin_count for s in symbols if s.pin_count]
+    # Closest pin count by bisection: only the neighbours of the insertion point can be nearest.
+    pins_sorted = sorted(symbol_pins)
     for fp in footprints:
-        if fp.pad_count and symbol_pins:
-            best_diff = min(abs(fp.pad_count - pins) for pins in symbol_pins)
+        if fp.pad_count:
+            i = bisect_left(pins_sorted, fp.pad_count)
+            best_diff = min(abs(fp.pad_count - pins_sorted[j]) for j in (i - 1, i) if 0 <= j < len(pins_sorted))
             if best_diff <= 1:
                 fp.combined_score = min(1.0, fp.combined_score + 0.1)
             elif best_diff >= 4:
@@ -81,4 +100,8 @@ def calc_combined(cf: CandidateFile) -> float:
 
 def update_combined_for_candidates(candidates: Iterable[CandidateFile]) -> None:
     for c in candidates:
-        c.combined_score = calc_combined(c)
+        score = calc_combined(c)
+        # Assigning an ORM attribute records history and dirties the row even when the value is
+        # the same; most recomputes (e.g. on save_selection) change nothing.
+        if c.combined_score != score:
+            c.combined_score = score
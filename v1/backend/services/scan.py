@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 from ..db.models import CandidateType
+from .ranking import path_trust_bonus
 
 
 @dataclass
@@ -25,26 +28,70 @@ SYMBOL_EXTS = {".kicad_sym"}
 FOOTPRINT_EXTS = {".kicad_mod"}
 MODEL_EXTS = {".step", ".stp", ".wrl", ".obj"}
 
+SCAN_WORKERS = int(os.getenv("KICOMPORT_SCAN_WORKERS", str(min(8, os.cpu_count() or 1))))
+_PARALLEL_SCAN_MIN_FILES = 16
+
+# Library files are scanned as raw bytes; only a matched description is decoded.
+_SYMBOL_DESCR_RE = re.compile(rb"(?:description|descr)\s+\"([^\"]+)\"")
+_FOOTPRINT_DESCR_RE = re.compile(rb"\((?:descr|description)\s+\"([^\"]+)\"")
+_PAD_RE = re.compile(rb"\(pad\s")
+_PART_NUMBER_RE = re.compile(r"^[a-zA-Z]{1,5}\d{2,}[a-zA-Z0-9-]*$")
+# Substring checks as one alternation each: a single C-level pass instead of one `in` per token.
+_PACKAGE_NAME_RE = re.compile("|".join(["qfn", "tqfp", "soic", "bga", "lqfp", "tssop", "sot", "dip"]))
+_DESCRIPTION_HINT_RE = re.compile("|".join(["footprint", "symbol", "connector", "package", "soic", "qfn", "tqfp"]))
+
 
 def scan_candidates(root: Path) -> List[CandidateData]:
-    candidates: List[CandidateData] = []
-    for path in root.rglob("*"):
-        if not path.is_file():
+    entries = [entry for entry in _iter_files(root) if _candidate_ext(entry.name)]
+    workers = min(SCAN_WORKERS, len(entries))
+    if workers <= 1 or len(entries) < _PARALLEL_SCAN_MIN_FILES:
+        return [_build_candidate(entry, root) for entry in entries]
+    # File reads dominate; map() keeps the walk order.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kicomport-scan") as pool:
+        return list(pool.map(lambda entry: _build_candidate(entry, root), entries))
+
+
+def _candidate_ext(name: str) -> str | None:
+    ext = os.path.splitext(name)[1].lower()
+    return ext if ext in SYMBOL_EXTS or ext in FOOTPRINT_EXTS or ext in MODEL_EXTS else None
+
+
+def _build_candidate(entry: os.DirEntry, root: Path) -> CandidateData:
+    path = Path(entry.path)
+    ext = path.suffix.lower()
+    if ext in SYMBOL_EXTS:
+        return _build_symbol(path, root)
+    if ext in FOOTPRINT_EXTS:
+        return _build_footprint(path, root)
+    return _build_model(path, root, entry.stat().st_size)
+
+
+def _iter_files(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Files under `root`, in the same order as `root.rglob("*")`, with each directory listed once.
+
+    Like rglob, symlinked directories are not descended into and unreadable directories are skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except PermissionError:
             continue
-        ext = path.suffix.lower()
-        if ext in SYMBOL_EXTS:
-            candidates.append(_build_symbol(path, root))
-        elif ext in FOOTPRINT_EXTS:
-            candidates.append(_build_footprint(path, root))
-        elif ext in MODEL_EXTS:
-            candidates.append(_build_model(path, root))
-    return candidates
+        subdirs = []
+        for entry in entries:
+            if entry.is_file():
+                yield entry
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        stack.extend(reversed(subdirs))
 
 
 def _build_symbol(path: Path, root: Path) -> CandidateData:
-    text = path.read_text(errors="ignore")
-    pin_count = len(re.findall(r"pin", text, flags=re.IGNORECASE))
-    description = _extract_first(text, r"(?:description|descr)\s+\"([^\"]+)\"")
+    data = path.read_bytes()
+    pin_count = data.lower().count(b"pin")
+    description = _extract_first(data, _SYMBOL_DESCR_RE)
     score = _heuristic_score(name=path.stem, pin_or_pad=pin_count, description=description, path=path)
     return CandidateData(
         type=CandidateType.symbol,
@@ -54,14 +101,14 @@ def _build_symbol(path: Path, root: Path) -> CandidateData:
         description=description or "",
         pin_count=pin_count,
         heuristic_score=score,
-        metadata={"size": path.stat().st_size},
+        metadata={"size": len(data)},
     )
 
 
 def _build_footprint(path: Path, root: Path) -> CandidateData:
-    text = path.read_text(errors="ignore")
-    pad_count = len(re.findall(r"\bpad\b", text, flags=re.IGNORECASE))
-    description = _extract_first(text, r"\((?:descr|description)\s+\"([^\"]+)\"")
+    data = path.read_bytes()
+    pad_count = len(_PAD_RE.findall(data))
+    description = _extract_first(data, _FOOTPRINT_DESCR_RE)
     score = _heuristic_score(name=path.stem, pin_or_pad=pad_count, description=description, path=path)
     return CandidateData(
         type=CandidateType.footprint,
@@ -71,12 +118,12 @@ def _build_footprint(path: Path, root: Path) -> CandidateData:
         description=description or "",
         pad_count=pad_count,
         heuristic_score=score,
-        metadata={"size": path.stat().st_size},
+        metadata={"size": len(data)},
     )
 
 
-def _build_model(path: Path, root: Path) -> CandidateData:
-    score = _model_score(path)
+def _build_model(path: Path, root: Path, size: int) -> CandidateData:
+    score = _model_score(path, size)
     return CandidateData(
         type=CandidateType.model,
         path=path,
@@ -84,7 +131,7 @@ def _build_model(path: Path, root: Path) -> CandidateData:
         name=path.stem,
         description=path.suffix,
         heuristic_score=score,
-        metadata={"size": path.stat().st_size},
+        metadata={"size": size},
     )
 
 
@@ -93,53 +140,40 @@ def _heuristic_score(name: str, pin_or_pad: int | None, description: str | None,
     name_lower = name.lower()
     if pin_or_pad:
         score += min(0.2, pin_or_pad / 200)
-    if any(tok in name_lower for tok in ["qfn", "tqfp", "soic", "bga", "lqfp", "tssop", "sot", "dip"]):
+    if _PACKAGE_NAME_RE.search(name_lower):
         score += 0.1
     if description:
         desc_lower = description.lower()
-        if any(tok in desc_lower for tok in ["footprint", "symbol", "connector", "package", "soic", "qfn", "tqfp"]):
+        if _DESCRIPTION_HINT_RE.search(desc_lower):
             score += 0.05
     else:
         score -= 0.1
     if _looks_like_part_number(name):
         score += 0.1
-    score += _path_trust_bonus(path) if path else 0.0
+    score += path_trust_bonus(path) if path else 0.0
     return round(min(max(score, 0.0), 1.0), 3)
 
 
-def _extract_first(text: str, pattern: str) -> str | None:
-    match = re.search(pattern, text)
+def _extract_first(data: bytes, pattern: re.Pattern[bytes]) -> str | None:
+    match = pattern.search(data)
     if not match:
         return None
     # description pattern might have group 2 when using (descr|description)
-    return match.group(2) if match.lastindex and match.lastindex >= 2 else match.group(1)
-
-
-def _path_trust_bonus(path: Path) -> float:
-    if not path:
-        return 0.0
-    high = {"kicad", "library", "libs", "official", "vendor", "verified", "prod", "production"}
-    low = {"temp", "tmp", "old", "backup", "legacy", "imported", "converted", "test"}
-    parts = {p.lower() for p in path.parts}
-    bonus = 0.0
-    if parts & high:
-        bonus += 0.05
-    if parts & low:
-        bonus -= 0.05
-    return bonus
+    raw = match.group(2) if match.lastindex and match.lastindex >= 2 else match.group(1)
+    return raw.decode("utf-8", errors="ignore")
 
 
 def _looks_like_part_number(name: str) -> bool:
-    return bool(re.match(r"^[a-zA-Z]{1,5}\d{2,}[a-zA-Z0-9-]*$", name))
+    return bool(_PART_NUMBER_RE.match(name))
 
 
-def _model_score(path: Path) -> float:
-    size_ok = path.stat().st_size > 0
+def _model_score(path: Path, size: int) -> float:
+    size_ok = size > 0
     base = 0.3 if size_ok else 0.1
     ext = path.suffix.lower()
     if ext in {".step", ".stp"}:
         base += 0.2  # prefer STEP
     elif ext == ".wrl":
         base += 0.05
-    base += _path_trust_bonus(path)
+    base += path_trust_bonus(path)
     return round(min(base, 1.0), 3)
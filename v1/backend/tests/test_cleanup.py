@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from v1.backend.config import AppConfig
+from v1.backend.db.models import Base, CandidateFile, CandidateType, Component, Job, JobLog
+from v1.backend.db.session import get_engine, get_session_factory
+from v1.backend.services import cleanup
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    return AppConfig(
+        uploads_dir=tmp_path / "uploads",
+        temp_dir=tmp_path / "tmp",
+        data_dir=tmp_path / "data",
+        database_path=tmp_path / "data" / "app.db",
+        retention_days=7,
+    )
+
+
+def _add_job(session, tmp_path: Path, name: str, updated_at: datetime) -> Job:
+    stored = tmp_path / "uploads" / f"upload_{name}.zip"
+    stored.parent.mkdir(parents=True, exist_ok=True)
+    stored.write_bytes(b"zip")
+    job = Job(md5=name, original_filename=f"{name}.zip", stored_path=str(stored), updated_at=updated_at)
+    session.add(job)
+    session.flush()
+    comp = Component(job_id=job.id, name=name)
+    session.add(comp)
+    session.flush()
+    cand = CandidateFile(component_id=comp.id, type=CandidateType.symbol, path="p", rel_path="p", name=name)
+    session.add(cand)
+    session.flush()
+    comp.selected_symbol_id = cand.id
+    session.add(JobLog(job_id=job.id, message="created"))
+    return job
+
+
+def test_purge_expired_jobs_removes_rows_and_files(tmp_path: Path):
+    cfg = _config(tmp_path)
+    Base.metadata.create_all(get_engine(cfg))
+    session = get_session_factory(cfg)()
+    try:
+        old = _add_job(session, tmp_path, "old", datetime.utcnow() - timedelta(days=30))
+        _add_job(session, tmp_path, "new", datetime.utcnow())
+        session.commit()
+        old_upload = Path(old.stored_path)
+
+        assert cleanup.purge_expired_jobs(session, cfg) == 1
+        session.commit()
+
+        assert session.scalars(select(Job.md5)).all() == ["new"]
+        for model in (Component, CandidateFile, JobLog):
+            assert session.scalar(select(func.count()).select_from(model)) == 1
+        assert not old_upload.exists()
+    finally:
+        session.close()
+
+
+def test_cleanup_orphans_keeps_referenced_files(tmp_path: Path):
+    cfg = _config(tmp_path)
+    Base.metadata.create_all(get_engine(cfg))
+    session = get_session_factory(cfg)()
+    try:
+        _add_job(session, tmp_path, "kept", datetime.utcnow())
+        session.commit()
+        orphan = tmp_path / "uploads" / "upload_orphan.zip"
+        orphan.write_bytes(b"zip")
+        stale_dir = tmp_path / "tmp" / "job_999"
+        stale_dir.mkdir(parents=True)
+
+        result = cleanup.cleanup_orphans(session, cfg)
+
+        assert result["removed_uploads"] == 1
+        assert result["removed_temp_dirs"] == 1
+        assert not orphan.exists() and not stale_dir.exists()
+        assert (tmp_path / "uploads" / "upload_kept.zip").exists()
+    finally:
+        session.close()
+
+
+def test_cleanup_orphans_removes_many_entries_in_parallel(tmp_path: Path, monkeypatch):
+    cfg = _config(tmp_path)
+    Base.metadata.create_all(get_engine(cfg))
+    monkeypatch.setattr(cleanup, "CLEANUP_WORKERS", 4)
+    session = get_session_factory(cfg)()
+    try:
+        (tmp_path / "uploads").mkdir()
+        for i in range(40):
+            (tmp_path / "uploads" / f"upload_{i}.zip").write_bytes(b"zip")
+            (tmp_path / "tmp" / f"job_{i}" / "nested").mkdir(parents=True)
+        (tmp_path / "uploads" / "keep.txt").write_text("not an upload")
+
+        result = cleanup.cleanup_orphans(session, cfg)
+
+        assert result["removed_uploads"] == 40
+        assert result["removed_temp_dirs"] == 40
+        assert [p.name for p in (tmp_path / "uploads").iterdir()] == ["keep.txt"]
+        assert not any((tmp_path / "tmp").iterdir())
+    finally:
+        session.close()
+
+
+def test_remove_tree_only_spawns_rm_for_large_trees(tmp_path: Path, monkeypatch):
+    spawned = []
+    real_run = cleanup.subprocess.run
+    monkeypatch.setattr(cleanup.subprocess, "run", lambda cmd, **kw: spawned.append(cmd) or real_run(cmd, **kw))
+    monkeypatch.setattr(cleanup, "_RM_MIN_ENTRIES", 10)
+
+    small = tmp_path / "small"
+    (small / "sub").mkdir(parents=True)
+    (small / "sub" / "a.txt").write_text("a")
+    cleanup.remove_tree(small)
+    assert not small.exists() and spawned == []
+
+    large = tmp_path / "large"
+    large.mkdir()
+    for i in range(12):
+        (large / f"f{i}.txt").write_text("x")
+    cleanup.remove_tree(large)
+    assert not large.exists()
+    assert len(spawned) == (1 if cleanup._RM_BIN else 0)
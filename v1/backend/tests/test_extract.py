@@ -0,0 +1,51 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from v1.backend.services import extract
+
+
+def _make_zip(path: Path, members: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_safe_extract_zip_parallel_writes_every_member(tmp_path: Path):
+    members = {f"lib/Part{i}.pretty/Part{i}.kicad_mod": f"(footprint Part{i})".encode() * 50 for i in range(40)}
+    archive = _make_zip(tmp_path / "parts.zip", members)
+    target = tmp_path / "out"
+    target.mkdir()
+
+    extract._safe_extract_zip(archive, target)
+
+    for name, data in members.items():
+        assert (target / name).read_bytes() == data
+
+
+def test_safe_extract_zip_rejects_path_traversal(tmp_path: Path):
+    archive = _make_zip(tmp_path / "evil.zip", {"../escape.txt": b"x"})
+    target = tmp_path / "out"
+    target.mkdir()
+
+    with pytest.raises(ValueError, match="Unsafe path"):
+        extract._safe_extract_zip(archive, target)
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_extract_if_needed_reuses_matching_target(tmp_path: Path):
+    archive = _make_zip(tmp_path / "parts.zip", {"Part.kicad_mod": b"(footprint Part)"})
+    target = tmp_path / "tmp" / "job_1"
+
+    extract.extract_if_needed(archive, tmp_path / "tmp", target_dir=target)
+    sentinel = target / "sentinel"
+    sentinel.write_text("kept")
+
+    assert extract.extract_if_needed(archive, tmp_path / "tmp", target_dir=target, reuse_existing=True) == target
+    assert sentinel.exists()
+
+    extract.extract_if_needed(archive, tmp_path / "tmp", target_dir=target)
+    assert not sentinel.exists()
+    assert (target / "Part.kicad_mod").exists()
@@ -1,7 +1,25 @@
+import errno
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from v1.backend.db.models import CandidateType
-from v1.backend.services.importer import _destination_for
+from sqlalchemy import select
+
+from v1.backend.config import AppConfig
+from v1.backend.db.models import Base, CandidateFile, CandidateType, Component, Job, JobLog, JobStatus
+from v1.backend.db.session import get_engine, get_session_factory
+from v1.backend.services.importer import (
+    _atomic_copy,
+    _destination_for,
+    _extract_symbols,
+    _merge_symbol_lib,
+    _merge_symbol_libs,
+    _next_available_copy,
+    _place_file,
+    _symbol_name,
+    import_job_selection,
+)
+from v1.backend.services.ranking import calc_combined
 
 
 class DummyCandidate:
@@ -45,3 +63,165 @@ def test_destination_for_model_rename_strips_known_extension_from_input():
     cand = DummyCandidate(CandidateType.model, Path("OldName.step"), "OldName", path="OldName.step")
     dest = _destination_for(cand, target, rename_to="MyPart.step")
     assert dest == target / "MyPart.step"
+
+
+def test_extract_symbols_returns_top_level_blocks_only():
+    text = (
+        '(kicad_symbol_lib (version 20211014)\n'
+        '  (symbol "R_(10k)" (property "Value" "say \\"hi\\" )")\n'
+        '    (symbol "R_(10k)_0_1" (rectangle)))\n'
+        '  (symbol Bare (pin))\n'
+        ')'
+    )
+    symbols = _extract_symbols(text)
+    assert [_symbol_name(s) for s in symbols] == ["R_(10k)", "Bare"]
+    assert symbols[0].endswith("(rectangle)))")
+    # The bytes path (used on mmap'd libraries) must split identically.
+    assert _extract_symbols(text.encode("utf-8")) == [sym.encode("utf-8") for sym in symbols]
+    assert [_symbol_name(s) for s in _extract_symbols(text.encode("utf-8"))] == ["R_(10k)", "Bare"]
+
+
+def test_next_available_copy_skips_taken_names(tmp_path: Path):
+    dest = tmp_path / "Part.kicad_mod"
+    assert _next_available_copy(dest) == dest
+    dest.touch()
+    (tmp_path / "Part_copy1.kicad_mod").touch()
+    assert _next_available_copy(dest) == tmp_path / "Part_copy2.kicad_mod"
+
+
+def _symbol_lib(path: Path, *names: str) -> Path:
+    blocks = "\n".join(f'  (symbol "{name}" (property "Value" "{name}"))' for name in names)
+    path.write_text(f"(kicad_symbol_lib (version 20211014)\n{blocks}\n)\n", encoding="utf-8")
+    return path
+
+
+def test_merge_symbol_lib_appends_and_tracks_external_edits(tmp_path: Path):
+    lib_dir = tmp_path / "symbols"
+    index_dir = tmp_path / "data" / "symbol_index"
+    dest = lib_dir / "~KiComport.kicad_sym"
+    assert _merge_symbol_lib(_symbol_lib(tmp_path / "a.kicad_sym", "A"), dest, index_dir=index_dir) == 1
+    assert _merge_symbol_lib(_symbol_lib(tmp_path / "b.kicad_sym", "B", "A"), dest, index_dir=index_dir) == 1
+    assert [_symbol_name(s) for s in _extract_symbols(dest.read_text())] == ["A", "B"]
+    assert dest.read_text().rstrip().endswith(")")
+    # The sidecar lives in the app's data, not in the user's KiCad library folder.
+    assert sorted(p.name for p in lib_dir.iterdir()) == ["~KiComport.kicad_sym"]
+    assert len(list(index_dir.iterdir())) == 1
+
+    # An edit made outside KiComport invalidates the sidecar index.
+    _symbol_lib(dest, "A", "B", "Edited")
+    assert _merge_symbol_lib(_symbol_lib(tmp_path / "c.kicad_sym", "Edited", "C"), dest, index_dir=index_dir) == 1
+    assert [_symbol_name(s) for s in _extract_symbols(dest.read_text())] == ["A", "B", "Edited", "C"]
+
+
+def test_merge_symbol_lib_rename_replaces_existing(tmp_path: Path):
+    dest = tmp_path / "~KiComport.kicad_sym"
+    _merge_symbol_lib(_symbol_lib(tmp_path / "a.kicad_sym", "A", "New"), dest)
+    added = _merge_symbol_lib(_symbol_lib(tmp_path / "b.kicad_sym", "Old"), dest, rename_to="New")
+    assert added == 1
+    assert [_symbol_name(s) for s in _extract_symbols(dest.read_text())] == ["A", "New"]
+
+
+def test_merge_symbol_libs_batches_sources_in_order(tmp_path: Path):
+    dest = tmp_path / "~KiComport.kicad_sym"
+    _merge_symbol_lib(_symbol_lib(tmp_path / "base.kicad_sym", "A"), dest)
+    sources = [(_symbol_lib(tmp_path / "b.kicad_sym", "B", "A"), None), (_symbol_lib(tmp_path / "c.kicad_sym", "C", "B"), None)]
+    assert _merge_symbol_libs(sources, dest) == [1, 1]
+    assert [_symbol_name(s) for s in _extract_symbols(dest.read_text())] == ["A", "B", "C"]
+
+    # With a rename every source targets the same name; the last one wins.
+    renamed = [(_symbol_lib(tmp_path / "x.kicad_sym", "X"), "X"), (_symbol_lib(tmp_path / "y.kicad_sym", "Y"), "Y")]
+    assert _merge_symbol_libs(renamed, dest, rename_to="Part") == [1, 1]
+    blocks = _extract_symbols(dest.read_text())
+    assert [_symbol_name(s) for s in blocks] == ["A", "B", "C", "Part"]
+    assert '"Y"' in blocks[-1]
+
+
+def test_place_file_reserves_unique_names_across_threads(tmp_path: Path):
+    sources = []
+    for i in range(12):
+        src = tmp_path / f"src{i}.step"
+        src.write_bytes(b"model %d" % i)
+        sources.append(src)
+    target = tmp_path / "3d" / "~KiComport"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        placed = list(pool.map(lambda src: _place_file(CandidateType.model, src, target / "Part.step", target), sources))
+
+    assert len(set(placed)) == 12
+    assert sorted(p.read_bytes() for p in placed) == sorted(src.read_bytes() for src in sources)
+
+
+def test_place_file_reuses_identical_destination(tmp_path: Path):
+    target = tmp_path / "3d" / "~KiComport"
+    model = tmp_path / "Part.step"
+    model.write_bytes(b"model")
+    assert _place_file(CandidateType.model, model, target / "Part.step", target) == target / "Part.step"
+    assert _place_file(CandidateType.model, model, target / "Part.step", target) == target / "Part.step"
+
+    model.write_bytes(b"other")
+    assert _place_file(CandidateType.model, model, target / "Part.step", target) == target / "Part_copy1.step"
+
+    fp_root = tmp_path / "fp.pretty"
+    fp = tmp_path / "Part.kicad_mod"
+    fp.write_text('(footprint "Part" (pad 1 smd rect))')
+    assert _place_file(CandidateType.footprint, fp, fp_root / "Part.kicad_mod", fp_root) == fp_root / "Part.kicad_mod"
+    assert _place_file(CandidateType.footprint, fp, fp_root / "Part.kicad_mod", fp_root) == fp_root / "Part.kicad_mod"
+    assert sorted(p.name for p in fp_root.iterdir() if p.suffix == ".kicad_mod") == ["Part.kicad_mod"]
+
+
+def test_atomic_copy_falls_back_when_kernel_copy_is_unsupported(tmp_path: Path, monkeypatch):
+    src = tmp_path / "big.step"
+    data = os.urandom(600_000)
+    src.write_bytes(data)
+
+    def unsupported(*_args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+    _atomic_copy(src, tmp_path / "out" / "big.step")
+    assert (tmp_path / "out" / "big.step").read_bytes() == data
+
+
+def test_import_job_selection_records_logs_and_feedback(tmp_path: Path):
+    cfg = AppConfig(data_dir=tmp_path / "data", database_path=tmp_path / "data" / "app.db")
+    Base.metadata.create_all(get_engine(cfg))
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "Part.kicad_mod").write_text('(footprint "Part" (pad 1 smd rect))')
+    (src / "Part.step").write_bytes(b"step")
+    session = get_session_factory(cfg)()
+    try:
+        job = Job(md5="m", original_filename="part.zip", stored_path="x", status=JobStatus.waiting_for_import)
+        session.add(job)
+        session.flush()
+        comp = Component(job_id=job.id, name="Part")
+        session.add(comp)
+        session.flush()
+        fp = CandidateFile(
+            component_id=comp.id, type=CandidateType.footprint, path=str(src / "Part.kicad_mod"), rel_path="Part.kicad_mod", name="Part"
+        )
+        model = CandidateFile(
+            component_id=comp.id, type=CandidateType.model, path=str(src / "Part.step"), rel_path="Part.step", name="Part"
+        )
+        session.add_all([fp, model])
+        session.flush()
+        comp.selected_footprint_id = fp.id
+        comp.selected_model_id = model.id
+        session.commit()
+
+        copied, destinations = import_job_selection(session, job, tmp_path / "sym", tmp_path / "fp", tmp_path / "3d")
+        session.commit()
+
+        assert copied == {"symbols": 0, "footprints": 1, "models": 1}
+        assert len(destinations) == 2
+        assert session.scalars(select(CandidateFile.selected_count)).all() == [1, 1]
+        for cand in (fp, model):
+            assert cand.feedback_score == 0.02
+            assert cand.combined_score == calc_combined(cand)
+        messages = session.scalars(select(JobLog.message).order_by(JobLog.id)).all()
+        assert messages[0].startswith("Imported model Part")
+        assert messages[-1] == "Import completed"
+        assert job.status == JobStatus.imported
+    finally:
+        session.close()
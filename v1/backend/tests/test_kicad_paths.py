@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from v1.backend.services import kicad_paths
 from v1.backend.services.kicad_paths import kicad_root_hint, map_kicad_visible_path
 
 
@@ -22,3 +23,26 @@ def test_map_kicad_visible_path():
         map_kicad_visible_path("/kicad/data/kicad/symbols", "/config")
         == "/config/data/kicad/symbols"
     )
+
+
+def test_find_kicad_config_dir_caches_hits_and_clears(tmp_path: Path, monkeypatch):
+    class Cfg:
+        kicad_symbol_dir = tmp_path / "share" / "symbols"
+        kicad_footprint_dir = tmp_path / "share" / "footprints"
+        kicad_3d_dir = tmp_path / "share" / "3d"
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    kicad_paths.clear_kicad_config_cache()
+    assert kicad_paths.find_kicad_config_dir(Cfg) is None
+
+    kicad_dir = tmp_path / "share" / ".config" / "kicad"
+    kicad_dir.mkdir(parents=True)
+    # Still negatively cached until the cache is cleared (as the install/config endpoints do).
+    assert kicad_paths.find_kicad_config_dir(Cfg) is None
+    kicad_paths.clear_kicad_config_cache()
+    assert kicad_paths.find_kicad_config_dir(Cfg) == kicad_dir
+    assert kicad_paths.find_kicad_config_dir(Cfg) == kicad_dir
+
+    kicad_dir.rmdir()
+    assert kicad_paths.find_kicad_config_dir(Cfg) is None
+    kicad_paths.clear_kicad_config_cache()
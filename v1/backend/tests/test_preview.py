@@ -0,0 +1,198 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import unquote
+
+import pytest
+
+from v1.backend.db.models import CandidateType
+from v1.backend.services import preview
+from v1.backend.services.preview import _build_svg, _render_footprint_svg, _render_symbol_svg
+
+
+def _decode(url: str) -> str:
+    prefix, payload = url.split(",", 1)
+    assert prefix == "data:image/svg+xml;charset=utf-8"
+    assert not set('"&<>#') & set(payload)
+    return unquote(payload)
+
+
+def test_build_svg_escapes_markup():
+    svg = _build_svg(['(property "Value" "<R&D>")'])
+    assert "&lt;R&amp;D&gt;" in svg
+    assert "<R&D>" not in svg
+
+
+def test_render_footprint_svg_draws_pads(tmp_path: Path):
+    path = tmp_path / "Part.kicad_mod"
+    path.write_text(
+        '(footprint "Part"\n'
+        '  (pad "1" smd rect (at -1 0) (size 1 1.5) (layers "F.Cu"))\n'
+        '  (pad "<2>" smd rect (at 1 0 90) (size 1 1.5) (layers "F.Cu"))\n'
+        '  (pad "3" smd rect\n    (at 0 2)\n    (size 1 1)\n    (layers "F.Cu")\n  )\n'
+        ")\n"
+    )
+    svg = _decode(_render_footprint_svg(path))
+    assert svg.count("<rect ") == 4
+    assert ">1</text>" in svg
+    assert ">&lt;2&gt;</text>" in svg
+    assert "rotate(-90.0)" in svg
+
+
+def test_render_symbol_svg_draws_pins_and_labels(tmp_path: Path):
+    path = tmp_path / "Part.kicad_sym"
+    path.write_text(
+        "(kicad_symbol_lib (version 20211014)\n"
+        '  (symbol "Part"\n'
+        '    (property "Reference" "U" (at 0 5 0))\n'
+        '    (property "Value" "A&B" (at 0 -5 0))\n'
+        '    (symbol "Part_0_1"\n'
+        "      (polyline\n"
+        "        (pts\n"
+        "          (xy -2 2)\n"
+        "          (xy 2 2)\n"
+        "        )\n"
+        "      )\n"
+        "    )\n"
+        '    (symbol "Part_1_1"\n'
+        "      (pin input line (at -5 0 0) (length 2.54)\n"
+        '        (name "IN" (effects (font (size 1.27 1.27))))\n'
+        '        (number "1" (effects (font (size 1.27 1.27))))\n'
+        "      )\n"
+        "      (pin output line (at 5 0 180) (length 2.54)\n"
+        '        (name "<OUT>" (effects (font (size 1.27 1.27))))\n'
+        '        (number "2" (effects (font (size 1.27 1.27))))\n'
+        "      )\n"
+        "    )\n"
+        "  )\n"
+        ")\n"
+    )
+    svg = _decode(_render_symbol_svg(path))
+    assert svg.count("<line ") == 2
+    assert svg.count("<polyline ") == 1
+    assert ">IN</text>" in svg and ">&lt;OUT&gt;</text>" in svg
+    assert ">A&amp;B</text>" in svg
+
+
+def test_render_candidate_preview_caches_until_file_changes(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Part.kicad_mod"
+    path.write_text('(footprint "Part" (pad "1" smd rect (at 0 0) (size 1 1)))')
+    cand = SimpleNamespace(id=1, type=CandidateType.footprint, name="Part", path=str(path))
+    calls = []
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", lambda c: (Path(c.path).read_text(), "Rendered via kicad-cli."))
+    real = preview._render_candidate_preview
+    monkeypatch.setattr(preview, "_render_candidate_preview", lambda c, p, size: calls.append(p) or real(c, p, size))
+
+    first = preview.render_candidate_preview(cand)
+    assert preview.render_candidate_preview(cand) == first
+    assert len(calls) == 1
+
+    path.write_text('(footprint "Part" (pad "1" smd rect (at 0 0) (size 2 2)))')
+    os.utime(path, ns=(0, 0))
+    assert preview.render_candidate_preview(cand) != first
+    assert len(calls) == 2
+
+
+def test_render_candidate_preview_does_not_cache_fallbacks(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Part.kicad_mod"
+    path.write_text('(footprint "Part" (pad "1" smd rect (at 0 0) (size 1 1)))')
+    cand = SimpleNamespace(id=3, type=CandidateType.footprint, name="Part", path=str(path))
+
+    def fail(c):
+        raise RuntimeError("kicad-cli timed out")
+
+    calls = []
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", lambda c: calls.append(c) or fail(c))
+    first = preview.render_candidate_preview(cand)
+    assert first[0].startswith("data:image/svg+xml")
+
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", lambda c: calls.append(c) or ("data:real", ""))
+    assert preview.render_candidate_preview(cand) == ("data:real", "")
+    assert len(calls) == 2
+
+
+def test_render_symbol_svg_anchors_vertical_pin_names(tmp_path: Path):
+    path = tmp_path / "Vertical.kicad_sym"
+    path.write_text(
+        '(kicad_symbol_lib (symbol "Vertical"'
+        ' (pin input line (at 0 -5 90) (length 2.54) (name "UP") (number "1"))'
+        ' (pin input line (at 0 5 270) (length 2.54) (name "DOWN") (number "2"))))'
+    )
+    svg = _decode(_render_symbol_svg(path))
+    assert 'text-anchor="start" dy="4">UP</text>' in svg
+    assert 'text-anchor="end" dy="4">DOWN</text>' in svg
+
+
+def test_render_footprint_svg_bounds_rotated_pads(tmp_path: Path):
+    path = tmp_path / "Part.kicad_mod"
+    path.write_text('(footprint "Part" (pad "1" smd rect (at 0 0 90) (size 4 1)))')
+    svg = _decode(_render_footprint_svg(path))
+    # Rotated 90°, the 4x1 pad spans 1 wide and 4 tall; with the 1 mm margin the box is 3x6.
+    cx, cy = (float(v) for v in svg.split("translate(", 1)[1].split(")", 1)[0].split(","))
+    assert abs(cx - 100.0) < 1e-6 and abs(cy - 200.0) < 1e-6
+
+
+def test_render_candidate_preview_parses_small_symbols_when_kicad_cli_is_unavailable(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Small.kicad_sym"
+    path.write_text('(kicad_symbol_lib (symbol "Small" (pin input line (at 0 0 0) (length 2.54) (name "A") (number "1"))))')
+    cand = SimpleNamespace(id=2, type=CandidateType.symbol, name="Small", path=str(path))
+
+    def no_cli(_cand):
+        raise AssertionError("kicad-cli should not run for small symbols")
+
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", no_cli)
+    monkeypatch.setattr(preview, "_kicad_cli_ready", lambda: False)
+    image, note = preview.render_candidate_preview(cand)
+    assert ">A</text>" in _decode(image) and note == ""
+
+
+def test_render_candidate_preview_prefers_kicad_cli_for_small_symbols(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Cli.kicad_sym"
+    path.write_text('(kicad_symbol_lib (symbol "Cli" (pin input line (at 0 0 0) (length 2.54))))')
+    cand = SimpleNamespace(id=4, type=CandidateType.symbol, name="Cli", path=str(path))
+    monkeypatch.setattr(preview, "_kicad_cli_ready", lambda: True)
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", lambda _cand: ("data:kicad-cli", "Rendered via kicad-cli."))
+    assert preview.render_candidate_preview(cand) == ("data:kicad-cli", "")
+
+
+def test_render_candidate_preview_does_not_cache_busy_slot_symbol_renders(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Busy.kicad_sym"
+    path.write_text('(kicad_symbol_lib (symbol "Busy" (pin input line (at 0 0 0) (length 2.54) (name "A") (number "1"))))')
+    cand = SimpleNamespace(id=5, type=CandidateType.symbol, name="Busy", path=str(path))
+    monkeypatch.setattr(preview.shutil, "which", lambda _cmd: "/usr/bin/kicad-cli")
+    monkeypatch.setattr(preview, "_kicad_cli_ready", lambda: False)
+    image, _ = preview.render_candidate_preview(cand)
+    assert ">A</text>" in _decode(image)
+
+    monkeypatch.setattr(preview, "_kicad_cli_ready", lambda: True)
+    monkeypatch.setattr(preview, "_render_symbol_or_footprint", lambda _cand: ("data:kicad-cli", "Rendered via kicad-cli."))
+    assert preview.render_candidate_preview(cand) == ("data:kicad-cli", "")
+
+
+def test_render_candidate_preview_keeps_3d_thumbnails_on_disk(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Part.step"
+    path.write_bytes(b"ISO-10303-21;")
+    cand = SimpleNamespace(id=3, type=CandidateType.model, name="Part", path=str(path))
+    calls = []
+    monkeypatch.setattr(preview, "_render_3d", lambda c: calls.append(c) or ("data:image/png;base64,AAAA", "note"))
+    thumbs = tmp_path / "thumbs"
+
+    assert preview.render_candidate_preview(cand, thumbs) == ("data:image/png;base64,AAAA", "")
+    preview._PREVIEW_CACHE.clear()  # as after a restart
+    assert preview.render_candidate_preview(cand, thumbs) == ("data:image/png;base64,AAAA", "")
+    assert len(calls) == 1
+    assert len(list(thumbs.iterdir())) == 1
+
+
+def test_render_candidate_preview_keeps_note_with_3d_thumbnail(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Noted.step"
+    path.write_bytes(b"ISO-10303-21;")
+    cand = SimpleNamespace(id=6, type=CandidateType.model, name="Noted", path=str(path))
+    rendered = ("data:image/png;base64,AAAA", "Rendered via trimesh/pyrender.")
+    monkeypatch.setattr(preview, "_render_candidate_preview", lambda c, p, size: (*rendered, True))
+    thumbs = tmp_path / "thumbs"
+
+    assert preview.render_candidate_preview(cand, thumbs) == rendered
+    preview._PREVIEW_CACHE.clear()
+    monkeypatch.setattr(preview, "_render_candidate_preview", lambda c, p, size: pytest.fail("re-rendered"))
+    assert preview.render_candidate_preview(cand, thumbs) == rendered
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from v1.backend.config import AppConfig
+from v1.backend.db.models import Base, CandidateFile, CandidateType, Component, Job
+from v1.backend.db.session import get_engine, get_session_factory
+from v1.backend.services import ranking
+
+
+def test_update_combined_for_candidates_only_touches_changed_rows(tmp_path: Path):
+    cfg = AppConfig(data_dir=tmp_path / "data", database_path=tmp_path / "data" / "app.db")
+    Base.metadata.create_all(get_engine(cfg))
+    session = get_session_factory(cfg)()
+    try:
+        job = Job(md5="m", original_filename="part.zip", stored_path="x")
+        session.add(job)
+        session.flush()
+        comp = Component(job_id=job.id, name="Part")
+        session.add(comp)
+        session.flush()
+        scores = [(0.5, 0.2, 0.1, 0.0), (0.9, 0.9, 0.3, 0.2)]
+        for h, a, q, f in scores:
+            session.add(
+                CandidateFile(
+                    component_id=comp.id, type=CandidateType.footprint, path="p", rel_path="p", name="Part",
+                    heuristic_score=h, ai_score=a, quality_score=q, feedback_score=f,
+                )
+            )
+        session.commit()
+
+        ranking.update_combined_for_candidates(comp.candidates)
+        assert [c.combined_score for c in comp.candidates] == [0.46, 1.0]
+        session.commit()
+
+        ranking.update_combined_for_candidates(comp.candidates)
+        assert not session.dirty
+    finally:
+        session.close()
+
+
+def test_consistency_adjustment_uses_closest_pin_count():
+    def cand(type_, pins=None, pads=None):
+        return CandidateFile(type=type_, path="p", rel_path="p", name="P", pin_count=pins, pad_count=pads, combined_score=0.5)
+
+    close, far, middle = (cand(CandidateType.footprint, pads=n) for n in (9, 30, 12))
+    comp = Component(name="P")
+    comp.candidates = [cand(CandidateType.symbol, pins=8), cand(CandidateType.symbol, pins=14), close, far, middle]
+    ranking.consistency_adjustment(comp)
+    assert [close.combined_score, far.combined_score, middle.combined_score] == [0.6, 0.45, 0.5]
@@ -18,3 +18,69 @@ def test_root_returns_ok_or_redirect(tmp_path, monkeypatch):
 
         health = client.get("/health")
         assert health.status_code == status.HTTP_200_OK
+
+
+def test_diagnostics_page_renders(tmp_path, monkeypatch):
+    config_path = tmp_path / "app_settings.yaml"
+    monkeypatch.setenv("KICOMPORT_CONFIG_PATH", str(config_path))
+
+    with TestClient(app) as client:
+        resp = client.get("/ui/diagnostics")
+        assert resp.status_code == status.HTTP_200_OK
+
+
+def test_job_detail_page_renders_preloaded_job(tmp_path, monkeypatch):
+    from v1.backend.db.models import CandidateFile, CandidateType, Component, Job, JobLog
+
+    config_path = tmp_path / "app_settings.yaml"
+    monkeypatch.setenv("KICOMPORT_CONFIG_PATH", str(config_path))
+
+    with TestClient(app) as client:
+        session = app.state.db_session_factory()
+        try:
+            job = Job(md5="abc", original_filename="part.zip", stored_path=str(tmp_path / "part.zip"))
+            session.add(job)
+            session.flush()
+            comp = Component(job_id=job.id, name="part")
+            session.add(comp)
+            session.flush()
+            session.add(
+                CandidateFile(
+                    component_id=comp.id,
+                    type=CandidateType.symbol,
+                    path=str(tmp_path / "part.kicad_sym"),
+                    rel_path="part.kicad_sym",
+                    name="part",
+                )
+            )
+            session.add(JobLog(job_id=job.id, message="created"))
+            session.commit()
+            job_id = job.id
+        finally:
+            session.close()
+
+        resp = client.get(f"/ui/jobs?job_id={job_id}")
+        assert resp.status_code == status.HTTP_200_OK
+        assert "part.zip" in resp.text
+
+
+def test_static_revisioned_urls_are_immutable(tmp_path, monkeypatch):
+    config_path = tmp_path / "app_settings.yaml"
+    monkeypatch.setenv("KICOMPORT_CONFIG_PATH", str(config_path))
+
+    with TestClient(app) as client:
+        static_rev = app.state.templates.env.globals["static_rev"]
+        stamped = client.get(f"/static/styles.css?v={static_rev('styles.css')}")
+        assert stamped.status_code == status.HTTP_200_OK
+        assert "immutable" in stamped.headers.get("cache-control", "")
+
+        # Each file is checked against its own revision, not the stylesheet's.
+        logo = client.get(f"/static/logo.svg?v={static_rev('logo.svg')}")
+        assert "immutable" in logo.headers.get("cache-control", "")
+        stale = client.get(f"/static/logo.svg?v={static_rev('logo.svg') + 1}")
+        assert stale.status_code == status.HTTP_200_OK
+        assert "immutable" not in stale.headers.get("cache-control", "")
+
+        plain = client.get("/static/styles.css")
+        assert plain.status_code == status.HTTP_200_OK
+        assert "immutable" not in plain.headers.get("cache-control", "")
@@ -22,3 +22,17 @@ def test_scan_candidates_detects_symbol_footprint_and_model(tmp_path: Path):
     assert "symbol" in types
     assert "footprint" in types
     assert "model" in types
+
+
+def test_scan_candidates_counts_pins_pads_and_reads_descriptions(tmp_path: Path):
+    (tmp_path / "part.kicad_sym").write_text('(symbol "part" (description "Op-amp µ") (pin 1) (PIN 2))', encoding="utf-8")
+    (tmp_path / "foot.kicad_mod").write_text(
+        '(footprint "foot" (descr "SOIC-8") (pad "1" smd rect) (pad "2" smd rect)\n  (pad\t"3" smd rect) (pad\n    "4" smd rect) (pad_to_mask_clearance 0))'
+    )
+
+    by_type = {c.type.value: c for c in scan.scan_candidates(tmp_path)}
+    assert by_type["symbol"].pin_count == 2
+    assert by_type["symbol"].description == "Op-amp µ"
+    assert by_type["footprint"].pad_count == 4
+    assert by_type["footprint"].description == "SOIC-8"
+    assert by_type["footprint"].metadata == {"size": (tmp_path / "foot.kicad_mod").stat().st_size}
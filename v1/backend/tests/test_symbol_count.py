@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from v1.backend.services.library_snapshot import count_kicad_symbols
+
+
+def test_count_kicad_symbols_counts_only_top_level(tmp_path: Path):
+    sym = tmp_path / "lib.kicad_sym"
+    sym.write_text(
+        '(kicad_symbol_lib (version 20211014)\n'
+        '  (symbol "B_Part" (property "Value" "x(") (symbol "B_Part_0_1" (pin)))\n'
+        '  (symbol "a\\"quoted" (symbol "a_1_1"))\n'
+        '  (symbol Bare)\n'
+        ')\n'
+    )
+    count, sample = count_kicad_symbols(sym)
+    assert count == 3
+    assert sample == ['a"quoted', "B_Part", "Bare"]
+
+
+def test_count_kicad_symbols_unbalanced(tmp_path: Path):
+    sym = tmp_path / "broken.kicad_sym"
+    sym.write_text('(kicad_symbol_lib (symbol "One" (pin)) (symbol "Two"')
+    count, sample = count_kicad_symbols(sym)
+    assert count == 2
+    assert sample == ["One", "Two"]
+
+
+def test_count_kicad_symbols_damaged_files(tmp_path: Path):
+    sym = tmp_path / "damaged.kicad_sym"
+    # A stray close paren before the library does not push its symbols off the top level.
+    sym.write_text(') (kicad_symbol_lib (symbol "One") (symbol "Two"))')
+    assert count_kicad_symbols(sym) == (2, ["One", "Two"])
+
+    # Quoted parens and escaped quotes in an unbalanced file don't shift the depth.
+    sym.write_text('(kicad_symbol_lib (symbol "A(\\"" (property "V" ")))")) (symbol "B"')
+    assert count_kicad_symbols(sym) == (2, ['A("', "B"])
+
+    # Truncated inside a string: nothing after the open quote is parsed.
+    sym.write_text('(kicad_symbol_lib (symbol "One" (property "V" "cut (symbol Lost')
+    assert count_kicad_symbols(sym) == (1, ["One"])
+
+    # Truncated inside a symbol name.
+    sym.write_text('(kicad_symbol_lib (symbol "One") (symbol "Tw')
+    assert count_kicad_symbols(sym) == (2, ["One", "Tw"])
+
+
+def test_count_kicad_symbols_pretty_printed(tmp_path: Path):
+    sym = tmp_path / "pretty.kicad_sym"
+    sym.write_text(
+        "(kicad_symbol_lib (version 20211014) (generator kicomport)\n"
+        '(symbol "Written" (in_bom yes)\n'
+        '    (symbol "Written_0_1" (pin))\n'
+        ")\n"
+        '\t(symbol "Tabbed"\n'
+        '\t\t(symbol "Tabbed_1_1")\n'
+        "\t)\n"
+        '  (symbol "Spaced"\n'
+        '    (symbol "Spaced_1_1")\n'
+        "  )\n"
+        ")\n"
+    )
+    count, sample = count_kicad_symbols(sym)
+    assert count == 3
+    assert sample == ["Spaced", "Tabbed", "Written"]
+
+
+def test_count_kicad_symbols_ignores_nested_units_at_shallow_indent(tmp_path: Path):
+    sym = tmp_path / "merged.kicad_sym"
+    sym.write_text(
+        "(kicad_symbol_lib (version 20211014)\n"
+        '(symbol "R"\n'
+        '  (property "Description" "first line\n'
+        '(symbol oops"\n'
+        "  )\n"
+        '  (symbol "R_0_1" (rectangle))\n'
+        '  (symbol "R_1_1" (pin))\n'
+        ")\n"
+        ")\n"
+    )
+    assert count_kicad_symbols(sym) == (1, ["R"])
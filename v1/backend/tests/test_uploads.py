@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from v1.backend.services.uploads import compute_md5
+from v1.backend.services.uploads import compute_md5, sanitize_filename
 
 
 def test_compute_md5(tmp_path: Path):
@@ -8,3 +8,14 @@ def test_compute_md5(tmp_path: Path):
     f.write_text("hello world")
     md5 = compute_md5(f)
     assert md5 == "5eb63bbbe01eeed093cb22bb8f5acdc3"
+
+
+def test_sanitize_filename_keeps_unicode_alphanumerics():
+    assert sanitize_filename(" Bauteil Ä-1_(rev B)/../x.zip ") == "Bauteil Ä-1_rev B..x.zip"
+    assert sanitize_filename("<>:") == "upload"
+
+
+def test_compute_md5_empty_file(tmp_path: Path):
+    f = tmp_path / "empty.zip"
+    f.touch()
+    assert compute_md5(f) == "d41d8cd98f00b204e9800998ecf8427e"